@@ -0,0 +1,85 @@
+"""Canonical JSON serialization shared by stored bodies and hash input.
+
+Kept free of other internal imports so that hash computation can use it directly.
+"""
+
+import json
+from typing import Mapping, Tuple, cast
+
+from immukv.json_helpers import JSONValue
+
+# Shared canonical encoder. json.dumps() constructs a fresh JSONEncoder on every call
+# when non-default options are passed; reusing one instance avoids that setup cost.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+
+def dumps_canonical(data: JSONValue) -> bytes:
+    """Serialize data to canonical JSON format for S3 storage.
+
+    Uses sorted keys and minimal separators for deterministic serialization.
+    This ensures consistent ETags for idempotent repair operations.
+
+    Uses ensure_ascii=True (default) to avoid Unicode normalization issues
+    and ensure deterministic output across all platforms and languages.
+
+    Returns UTF-8 encoded bytes ready for S3 upload (the output is pure ASCII,
+    so it is encoded with the cheaper ASCII codec).
+    """
+    json_str: str = _CANONICAL_ENCODER.encode(data)
+    return json_str.encode("ascii")
+
+
+def dumps_canonical_with_value(data: Mapping[str, object], value_json: bytes) -> bytes:
+    """Serialize an entry object to canonical JSON around a pre-serialized value.
+
+    Log entries, key objects and hash input all carry a "value" field whose name
+    sorts after every other field name, so in canonical form it is always the last
+    member. This lets the (potentially large) user value be serialized once per
+    write and spliced into each body. The output is byte-identical to
+    dumps_canonical() of the full object.
+
+    Any "value" entry in data is ignored in favor of value_json.
+
+    Args:
+        data: Entry fields (JSON-serializable)
+        value_json: dumps_canonical() output for the entry's value
+
+    Raises:
+        ValueError: If data contains a field name that sorts after "value"
+    """
+    fields = {k: v for k, v in data.items() if k != "value"}
+    if not fields:
+        return b'{"value":' + value_json + b"}"
+    if max(fields) > "value":
+        raise ValueError(f"Field name sorts after 'value': {max(fields)!r}")
+    head = dumps_canonical(cast(JSONValue, fields))
+    return head[:-1] + b',"value":' + value_json + b"}"
+
+
+def dumps_canonical_around(
+    data: Mapping[str, object], field: str, value_json: bytes
+) -> Tuple[bytes, bytes]:
+    """Serialize an entry object to canonical JSON with one field's value left open.
+
+    Returns (head, tail) such that head + dumps_canonical(x) + tail equals
+    dumps_canonical_with_value() of data with data[field] = x. Lets a body be
+    prepared before the value of that field is known.
+
+    Args:
+        data: Entry fields other than field (JSON-serializable)
+        field: Name of the open field; must sort before "value"
+        value_json: dumps_canonical() output for the entry's value
+
+    Raises:
+        ValueError: If field does not sort before "value"
+    """
+    if field >= "value":
+        raise ValueError(f"Field name does not sort before 'value': {field!r}")
+    before = {k: v for k, v in data.items() if k < field}
+    after = {k: v for k, v in data.items() if k > field}
+    head = dumps_canonical(cast(JSONValue, before))[:-1]
+    if before:
+        head += b","
+    head += dumps_canonical(field) + b":"
+    tail = b"," + dumps_canonical_with_value(after, value_json)[1:]
+    return head, tail
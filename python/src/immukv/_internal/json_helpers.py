@@ -1,6 +1,5 @@
 """Internal JSON helper functions not exposed in public API."""
 
-import json
 from typing import Callable, Dict, Optional, TypeVar, cast
 
 from immukv._internal.types import RawEntry, hash_from_json, sequence_from_json, timestamp_from_json
@@ -12,22 +11,6 @@ K = TypeVar("K", bound=str)
 V = TypeVar("V")
 
 
-def strip_none_values(data: Dict[str, JSONValue]) -> Dict[str, JSONValue]:
-    """Strip None values from the immediate outer layer of a dictionary.
-
-    This ensures consistency with TypeScript behavior where undefined values
-    are omitted from JSON serialization. Only strips None from the top level,
-    does not recurse into nested dictionaries.
-
-    Args:
-        data: Dictionary potentially containing None values
-
-    Returns:
-        New dictionary with None values removed from top level
-    """
-    return {k: v for k, v in data.items() if v is not None}
-
-
 def get_str(data: Dict[str, JSONValue], key: str) -> str:
     """Extract string field from parsed JSON dict.
 
@@ -163,18 +146,3 @@ def raw_entry_from_log(data: Dict[str, JSONValue], version_id: LogVersionId[K])
             KeyObjectETag(prev_key_etag_str) if prev_key_etag_str is not None else None
         ),
     )
-
-
-def dumps_canonical(data: JSONValue) -> bytes:
-    """Serialize data to canonical JSON format for S3 storage.
-
-    Uses sorted keys and minimal separators for deterministic serialization.
-    This ensures consistent ETags for idempotent repair operations.
-
-    Uses ensure_ascii=True (default) to avoid Unicode normalization issues
-    and ensure deterministic output across all platforms and languages.
-
-    Returns UTF-8 encoded bytes ready for S3 upload.
-    """
-    json_str: str = json.dumps(data, sort_keys=True, separators=(",", ":"))
-    return json_str.encode("utf-8")
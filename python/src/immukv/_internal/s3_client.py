@@ -4,14 +4,16 @@ This client is not part of the public API and should only be used internally.
 """
 
 import asyncio
-from collections.abc import Coroutine
+from collections.abc import Coroutine, Sequence
+from concurrent.futures import Future
 from io import BytesIO
-from typing import TYPE_CHECKING, Literal, Optional, TypeVar
+from typing import TYPE_CHECKING, Dict, List, Literal, Optional, TypeVar
 
 if TYPE_CHECKING:
     from types_aiobotocore_s3.client import S3Client
     from types_aiobotocore_s3.type_defs import (
         GetObjectRequestTypeDef,
+        ListObjectsV2RequestTypeDef,
         ListObjectVersionsRequestTypeDef,
         PutObjectRequestTypeDef,
     )
@@ -33,6 +35,10 @@ from immukv._internal.s3_types import (
 K = TypeVar("K", bound=str)
 _T = TypeVar("_T")
 
+# Upper bound on in-flight requests for batched version reads. Matches botocore's
+# default connection pool size (max_pool_connections=10).
+MAX_CONCURRENT_GETS = 10
+
 
 class BrandedS3Client:
     """Branded S3 client wrapper returning nominally-typed responses.
@@ -86,6 +92,35 @@ class BrandedS3Client:
             "VersionId": response.get("VersionId"),
         }
 
+    def get_object_versions(
+        self,
+        bucket: str,
+        key: S3KeyPath[K],
+        version_ids: Sequence[str],
+    ) -> List[GetObjectOutput[K]]:
+        """Get several versions of one object concurrently (synchronous).
+
+        Requests are issued together on the background loop, bounded by
+        MAX_CONCURRENT_GETS. Results are returned in the order of version_ids.
+        """
+        if not version_ids:
+            return []
+        return self._run(self._async_get_object_versions(bucket, key, version_ids))
+
+    async def _async_get_object_versions(
+        self,
+        bucket: str,
+        key: S3KeyPath[K],
+        version_ids: Sequence[str],
+    ) -> List[GetObjectOutput[K]]:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GETS)
+
+        async def _get(version_id: str) -> GetObjectOutput[K]:
+            async with semaphore:
+                return await self._async_get_object(bucket, key, version_id)
+
+        return list(await asyncio.gather(*(_get(version_id) for version_id in version_ids)))
+
     # -- PutObject ----------------------------------------------------------
 
     def put_object(
@@ -98,6 +133,7 @@ class BrandedS3Client:
         if_none_match: Optional[str] = None,
         server_side_encryption: Optional[Literal["AES256", "aws:kms", "aws:kms:dsse"]] = None,
         sse_kms_key_id: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
     ) -> PutObjectOutput[K]:
         """Put object to S3 (synchronous)."""
         return self._run(
@@ -110,9 +146,32 @@ class BrandedS3Client:
                 if_none_match,
                 server_side_encryption,
                 sse_kms_key_id,
+                metadata,
             )
         )
 
+    def submit_put_object(
+        self,
+        bucket: str,
+        key: S3KeyPath[K],
+        body: bytes,
+        content_type: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> "Future[PutObjectOutput[K]]":
+        """Start a put_object on the background loop without waiting for it.
+
+        The caller can do other work while the request is in flight and collect
+        the response (or error) with future.result().
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._async_put_object(
+                bucket, key, body, content_type, if_match, if_none_match, metadata=metadata
+            ),
+            self._loop,
+        )
+
     async def _async_put_object(
         self,
         bucket: str,
@@ -123,6 +182,7 @@ class BrandedS3Client:
         if_none_match: Optional[str] = None,
         server_side_encryption: Optional[Literal["AES256", "aws:kms", "aws:kms:dsse"]] = None,
         sse_kms_key_id: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
     ) -> PutObjectOutput[K]:
         request: "PutObjectRequestTypeDef" = {"Bucket": bucket, "Key": key, "Body": body}
         if content_type is not None:
@@ -135,6 +195,8 @@ class BrandedS3Client:
             request["ServerSideEncryption"] = server_side_encryption
         if sse_kms_key_id is not None:
             request["SSEKMSKeyId"] = sse_kms_key_id
+        if metadata is not None:
+            request["Metadata"] = metadata
 
         response = await self._s3.put_object(**request)
         return PutObjectOutputs.from_aiobotocore(response)
@@ -196,6 +258,7 @@ class BrandedS3Client:
         prefix: str,
         start_after: Optional[str] = None,
         continuation_token: Optional[str] = None,
+        max_keys: Optional[int] = None,
     ) -> ListObjectsV2Output:
         """List objects (single page, synchronous).
 
@@ -203,7 +266,7 @@ class BrandedS3Client:
         pagination by passing back NextContinuationToken.
         """
         return self._run(
-            self._async_list_objects_v2(bucket, prefix, start_after, continuation_token)
+            self._async_list_objects_v2(bucket, prefix, start_after, continuation_token, max_keys)
         )
 
     async def _async_list_objects_v2(
@@ -212,17 +275,17 @@ class BrandedS3Client:
         prefix: str,
         start_after: Optional[str] = None,
         continuation_token: Optional[str] = None,
+        max_keys: Optional[int] = None,
     ) -> ListObjectsV2Output:
+        request: "ListObjectsV2RequestTypeDef" = {"Bucket": bucket, "Prefix": prefix}
         if continuation_token is not None:
-            response = await self._s3.list_objects_v2(
-                Bucket=bucket, Prefix=prefix, ContinuationToken=continuation_token
-            )
+            request["ContinuationToken"] = continuation_token
         elif start_after is not None:
-            response = await self._s3.list_objects_v2(
-                Bucket=bucket, Prefix=prefix, StartAfter=start_after
-            )
-        else:
-            response = await self._s3.list_objects_v2(Bucket=bucket, Prefix=prefix)
+            request["StartAfter"] = start_after
+        if max_keys is not None:
+            request["MaxKeys"] = max_keys
+
+        response = await self._s3.list_objects_v2(**request)
 
         contents_raw = response.get("Contents")
         contents: Optional[list[Object]] = None
@@ -4,10 +4,22 @@ These functions are not part of the public API and should only be used internall
 """
 
 import json
+import re
 from typing import Any, Dict, Union, List, cast
 
 from immukv._internal.s3_types import ClientErrorResponse
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# orjson turns integers outside the 64-bit range into floats where json.loads keeps
+# them exact. Any such literal has at least 19 digits, so those bodies use json.loads.
+_LONG_DIGIT_RUN = re.compile(rb"\d{19}")
+
 # Represents any valid JSON value
 JSONValue = Union[
     None,
@@ -25,9 +37,30 @@ def read_body_as_json(body: object) -> Dict[str, JSONValue]:
 
     Centralizes json.loads() cast to satisfy disallow_any_expr.
     """
+    return parse_json_bytes(read_body_bytes(body))
+
+
+def read_body_bytes(body: object) -> bytes:
+    """Read S3 Body object into bytes."""
     body_data = cast(Any, body).read()  # type: ignore[misc,explicit-any]
-    json_str = cast(str, body_data.decode("utf-8") if isinstance(body_data, bytes) else body_data)  # type: ignore[misc]
-    return cast(Dict[str, JSONValue], json.loads(json_str))
+    if isinstance(body_data, str):  # type: ignore[misc]
+        return body_data.encode("utf-8")
+    return cast(bytes, body_data)  # type: ignore[misc]
+
+
+def parse_json_bytes(body_data: bytes) -> Dict[str, JSONValue]:
+    """Parse an S3 object body as JSON.
+
+    Uses orjson when installed (the "orjson" extra). Its result is identical to
+    json.loads(); input it handles differently (NaN/Infinity, integers beyond
+    64 bits) falls back to json.loads().
+    """
+    if _HAS_ORJSON and _LONG_DIGIT_RUN.search(body_data) is None:
+        try:
+            return cast(Dict[str, JSONValue], orjson.loads(body_data))  # type: ignore[misc]
+        except orjson.JSONDecodeError:
+            pass
+    return cast(Dict[str, JSONValue], json.loads(body_data.decode("utf-8")))
 
 
 def get_error_code(error: Exception) -> str:
@@ -37,3 +70,9 @@ def get_error_code(error: Exception) -> str:
     """
     error_response = cast(ClientErrorResponse, cast(Any, error).response)  # type: ignore[misc,explicit-any]
     return cast(str, error_response["Error"]["Code"])
+
+
+def get_retry_attempts(error: Exception) -> int:
+    """Extract the number of SDK retries behind a ClientError (0 if not reported)."""
+    error_response = cast(ClientErrorResponse, cast(Any, error).response)  # type: ignore[misc,explicit-any]
+    return error_response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
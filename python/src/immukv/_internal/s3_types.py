@@ -3,7 +3,7 @@
 These types are not part of the public API and should only be used internally.
 """
 
-from typing import TYPE_CHECKING, Generic, List, TypedDict, TypeVar, Optional
+from typing import TYPE_CHECKING, Dict, Generic, List, NotRequired, TypedDict, TypeVar, Optional
 
 from immukv.types import KeyObjectETag, KeyVersionId, LogVersionId
 
@@ -56,6 +56,8 @@ class LogKey(str):
 class S3KeyPath(str, Generic[K]):
     """S3 path string carrying the key type K for type safety."""
 
+    __slots__ = ()
+
     def __new__(cls, value: str) -> "S3KeyPath[K]":
         return str.__new__(cls, value)
 
@@ -74,7 +76,33 @@ class S3KeyPaths:
         Returns:
             S3 path for the key object file
         """
-        return S3KeyPath[K](f"{prefix}keys/{key}.json")
+        return S3KeyPaths.for_key_in(S3KeyPaths.keys_prefix(prefix), key)
+
+    @staticmethod
+    def keys_prefix(prefix: str) -> str:
+        """Create the S3 prefix under which all key objects are stored.
+
+        Args:
+            prefix: S3 key prefix (e.g., "prefix/")
+
+        Returns:
+            Key object prefix (e.g., "prefix/keys/")
+        """
+        return f"{prefix}keys/"
+
+    @staticmethod
+    def for_key_in(keys_prefix: str, key: K) -> S3KeyPath[K]:
+        """Create S3 path for a key object from a precomputed keys_prefix().
+
+        Args:
+            keys_prefix: Result of keys_prefix()
+            key: The key value
+
+        Returns:
+            S3 path for the key object file
+        """
+        # Plain S3KeyPath(...) - subscripting the generic class on every call is costly
+        return S3KeyPath(keys_prefix + key + ".json")
 
     @staticmethod
     def for_log(prefix: str) -> S3KeyPath[LogKey]:
@@ -86,7 +114,7 @@ class S3KeyPaths:
         Returns:
             S3 path for the log file
         """
-        return S3KeyPath[LogKey](f"{prefix}_log.json")
+        return S3KeyPath(f"{prefix}_log.json")
 
 
 # Response type definitions (only fields we actually use, no Any types)
@@ -179,6 +207,7 @@ class HeadObjectOutput(TypedDict, Generic[K]):
 
     ETag: str  # Always returned per AWS docs
     VersionId: Optional[str]  # Optional (absent when versioning disabled)
+    Metadata: Dict[str, str]  # User metadata (x-amz-meta-*), empty when none
 
 
 class HeadObjectOutputs:
@@ -194,6 +223,7 @@ class HeadObjectOutputs:
         return {
             "ETag": assert_aws_field_present(response.get("ETag"), "HeadObjectOutput.ETag"),
             "VersionId": response.get("VersionId"),
+            "Metadata": response.get("Metadata", {}),
         }
 
     @staticmethod
@@ -314,7 +344,14 @@ class ErrorResponse(TypedDict):
     Message: str
 
 
+class ErrorResponseMetadata(TypedDict, total=False):
+    """Botocore response metadata (only the fields used by the client)."""
+
+    RetryAttempts: int
+
+
 class ClientErrorResponse(TypedDict):
     """Botocore ClientError response structure."""
 
     Error: ErrorResponse
+    ResponseMetadata: NotRequired[ErrorResponseMetadata]
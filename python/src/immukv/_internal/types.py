@@ -5,6 +5,8 @@ import time
 from dataclasses import dataclass
 from typing import Generic, NotRequired, Optional, TypedDict, TypeVar
 
+from immukv._internal.canonical import dumps_canonical, dumps_canonical_with_value
+
 # Re-export these from parent for internal use
 from immukv.json_helpers import JSONValue
 from immukv.types import Hash, KeyObjectETag, LogVersionId, Sequence, TimestampMs
@@ -113,22 +115,22 @@ class KeyObjectDict(TypedDict):
 # Factory functions for branded types
 
 
-def hash_compute(data: LogEntryForHash[K, V]) -> Hash[K]:
+def hash_compute(data: LogEntryForHash[K, V], value_json: Optional[bytes] = None) -> Hash[K]:
     """Compute SHA-256 hash from log entry data.
 
     Args:
         data: Log entry data to hash (excludes version_id, log_version_id, hash)
+        value_json: Canonical JSON of data["value"], if the caller already has it.
+            Avoids serializing the value again when it is also uploaded.
 
     Returns:
         Hash in format 'sha256:<64 hex characters>'
     """
-    # Import here to avoid circular dependency
-    from immukv._internal.json_helpers import dumps_canonical
-
-    canonical_bytes = dumps_canonical(data)  # type: ignore[arg-type]
-    hash_bytes = hashlib.sha256(canonical_bytes).digest()
-    hash_hex = hash_bytes.hex()
-    return Hash(f"sha256:{hash_hex}")
+    if value_json is not None:
+        canonical_bytes = dumps_canonical_with_value(data, value_json)
+    else:
+        canonical_bytes = dumps_canonical(data)  # type: ignore[arg-type]
+    return Hash("sha256:" + hashlib.sha256(canonical_bytes).hexdigest())
 
 
 def hash_genesis() -> Hash[K]:
@@ -201,7 +203,7 @@ def timestamp_now() -> TimestampMs[K]:
     Returns:
         Current Unix epoch time in milliseconds
     """
-    return TimestampMs(int(time.time() * 1000))
+    return TimestampMs(time.time_ns() // 1_000_000)
 
 
 def timestamp_from_json(n: int) -> TimestampMs[K]:
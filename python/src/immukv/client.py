@@ -5,23 +5,29 @@ import json
 import logging
 import threading
 import time
+import uuid
+from collections import OrderedDict
 from collections.abc import Coroutine
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import AsyncExitStack
-from typing import TYPE_CHECKING, Any, Dict, Generic, List, Optional, Tuple, TypeVar, cast
+from typing import TYPE_CHECKING, Dict, Generic, List, Optional, Set, Tuple, TypeVar, cast
 
 from botocore.exceptions import ClientError
 
 if TYPE_CHECKING:
     from types_aiobotocore_s3.client import S3Client
 
-from immukv._internal.json_helpers import (
+from immukv._internal.canonical import (
     dumps_canonical,
+    dumps_canonical_around,
+    dumps_canonical_with_value,
+)
+from immukv._internal.json_helpers import (
     entry_from_key_object,
     entry_from_log,
     get_int,
     get_str,
     raw_entry_from_log,
-    strip_none_values,
 )
 from immukv._internal.types import (
     JSONValue,
@@ -41,11 +47,19 @@ from immukv._internal.types import (
 )
 from immukv.json_helpers import ValueDecoder, ValueEncoder
 from immukv._internal.s3_client import BrandedS3Client
-from immukv._internal.s3_helpers import get_error_code, read_body_as_json
+from immukv._internal.s3_helpers import (
+    get_error_code,
+    get_retry_attempts,
+    parse_json_bytes,
+    read_body_as_json,
+    read_body_bytes,
+)
 from immukv._internal.s3_types import (
+    GetObjectOutputs,
     HeadObjectOutputs,
     LogKey,
     ObjectVersions,
+    PutObjectOutput,
     PutObjectOutputs,
     S3KeyPath,
     S3KeyPaths,
@@ -74,6 +88,14 @@ V = TypeVar("V")
 V2 = TypeVar("V2")
 _T = TypeVar("_T")
 
+# User metadata field (x-amz-meta-*) carrying the ID of the set() attempt that wrote a log version
+WRITE_ID_METADATA_KEY = "immukv-write-id"
+
+# Total size of the log entry bodies get_log_version keeps in memory; a body larger
+# than a sixteenth of this is not cached, so a few large values cannot fill it
+LOG_BODY_CACHE_MAX_BYTES = 8 * 1024 * 1024
+LOG_BODY_CACHE_MAX_BODY_BYTES = LOG_BODY_CACHE_MAX_BYTES // 16
+
 
 class ImmuKVClient(Generic[K, V]):
     """Main client interface - Simple S3 versioning with auto-repair.
@@ -90,12 +112,22 @@ class ImmuKVClient(Generic[K, V]):
     _exit_stack: AsyncExitStack
     _s3: BrandedS3Client
     _owns_loop: bool
+    _bucket: str
+    _keys_prefix: str
     _log_key: S3KeyPath[LogKey]
     _value_decoder: ValueDecoder[V]
     _value_encoder: ValueEncoder[V]
-    _last_repair_check_ms: int
+    _next_repair_ms: int
     _can_write: Optional[bool]
     _latest_orphan_status: Optional[OrphanStatus[K]]
+    _key_etag_cache: Dict[K, KeyObjectETag[K]]
+    _existing_key_objects: Set[K]
+    _log_body_cache: "OrderedDict[LogVersionId[K], bytes]"
+    _log_body_cache_bytes: int
+    _key_writer: Optional[ThreadPoolExecutor]
+    _pending_key_write: Optional["Future[Optional[KeyObjectETag[K]]]"]
+    _last_log_state: Optional[LatestLogState[K]]
+    _last_written_log_version_id: Optional[LogVersionId[K]]
 
     def __init__(
         self, config: Config, value_decoder: ValueDecoder[V], value_encoder: ValueEncoder[V]
@@ -130,10 +162,23 @@ class ImmuKVClient(Generic[K, V]):
                     client_params["aws_secret_access_key"] = creds.aws_secret_access_key
                     if creds.aws_session_token is not None:
                         client_params["aws_session_token"] = creds.aws_session_token
+            botocore_config = config.overrides.botocore_config
             if config.overrides.force_path_style:
                 from botocore.config import Config as BotocoreConfig
 
-                client_params["config"] = BotocoreConfig(s3={"addressing_style": "path"})
+                # Keep any other S3 options of a user-provided config
+                s3_options = cast(Optional[Dict[str, object]], getattr(botocore_config, "s3", None))
+                path_style = BotocoreConfig(
+                    s3={  # type: ignore[arg-type]
+                        **(s3_options if s3_options is not None else {}),
+                        "addressing_style": "path",
+                    }
+                )
+                botocore_config = (
+                    path_style if botocore_config is None else botocore_config.merge(path_style)
+                )
+            if botocore_config is not None:
+                client_params["config"] = botocore_config
 
         # Start background IO thread
         self._loop = asyncio.new_event_loop()
@@ -148,10 +193,20 @@ class ImmuKVClient(Generic[K, V]):
             self._create_aio_client(client_params, credential_provider)
         )
         self._s3 = BrandedS3Client(aio_client, self._loop)
-        self._log_key = cast(S3KeyPath[LogKey], S3KeyPaths.for_log(config.s3_prefix))
-        self._last_repair_check_ms = 0  # In-memory timestamp tracking
+        self._bucket = config.s3_bucket
+        self._keys_prefix = S3KeyPaths.keys_prefix(config.s3_prefix)
+        self._log_key = S3KeyPaths.for_log(config.s3_prefix)
+        self._next_repair_ms = 0  # Deadline of the next orphan repair check in get()
         self._can_write: Optional[bool] = None  # Permission cache
         self._latest_orphan_status: Optional[OrphanStatus[K]] = None  # Orphan detection cache
+        self._key_etag_cache = {}  # Key object ETags observed by this client
+        self._existing_key_objects = set()  # Keys whose key object is known to exist
+        self._log_body_cache = OrderedDict()  # Log entry bodies by version ID (LRU)
+        self._log_body_cache_bytes = 0  # Total size of the cached bodies
+        self._key_writer = None  # Created on first deferred key object write
+        self._pending_key_write = None
+        self._last_log_state = None  # Log state to start the next set() from
+        self._last_written_log_version_id = None  # Log version of this client's last set()
 
     def _run_on_loop(self, coro: Coroutine[object, object, _T]) -> _T:
         """Submit coroutine to background loop, block for result.
@@ -212,18 +267,33 @@ class ImmuKVClient(Generic[K, V]):
 
         Note: Returns successfully even if phase 2 fails. Entry always exists in log.
               If phase 2 fails, orphan will be auto-repaired on next write.
+
+        With Config.defer_key_object_write, phase 2 runs in the background and the
+        returned Entry has previous_key_object_etag=None.
         """
         # Check read-only mode at entry
         if self._config.read_only:
             raise ReadOnlyError("Cannot call set() in read-only mode")
 
+        self._wait_for_pending_key_write()
+
         # Retry loop for optimistic locking on log writes
         max_retries = 10
         last_error: Optional[ClientError] = None
 
         for attempt in range(max_retries):
             # ===== Pre-Flight: Repair (with ETag) =====
-            result = self._get_latest_and_repair()
+            # The log state left by this client's last complete write (or last repair
+            # check) is used instead of reading the log. The IfMatch below only
+            # succeeds while the log still ends at that entry, which has no orphan;
+            # if another client has written since, it fails and the retry falls
+            # back to a full pre-flight.
+            cached_state = self._last_log_state
+            self._last_log_state = None
+            if cached_state is not None:
+                result = cached_state
+            else:
+                result = self._get_latest_and_repair()
             log_etag = result["log_etag"]
             prev_version_id = result["prev_version_id"]
             prev_hash = result["prev_hash"]
@@ -238,7 +308,10 @@ class ImmuKVClient(Generic[K, V]):
                 self._can_write = can_write
             if orphan_status is not None:
                 self._latest_orphan_status = orphan_status
-            self._last_repair_check_ms = int(time.time() * 1000)
+            if result is not cached_state:
+                self._next_repair_ms = (
+                    time.time_ns() // 1_000_000 + self._config.repair_check_interval_ms
+                )
 
             # Part 2: Fail if orphan repair was not successful
             # can_write=None and orphan_status=None means _repair_orphan hit an unexpected error
@@ -254,15 +327,21 @@ class ImmuKVClient(Generic[K, V]):
             # Step 1: Get current key object ETag (for storing in log entry)
             # If the repaired orphan's key matches the target key, use the repaired ETag
             # instead of doing a separate head_object (avoids stale ETag from eventual consistency)
-            key_path = S3KeyPaths.for_key(self._config.s3_prefix, key)
+            key_path = self._key_path(key)
             current_key_etag: Optional[KeyObjectETag[K]] = None
+            key_etag_from_cache = False
 
             if repaired_key == key and repaired_key_object_etag is not None:
                 # Use the ETag from the repair put_object - guaranteed fresh
                 current_key_etag = repaired_key_object_etag
+            elif key in self._key_etag_cache:
+                # Use the ETag this client last saw for the key (skips head_object).
+                # Phase 2 detects a stale ETag via PreconditionFailed and recovers.
+                current_key_etag = self._key_etag_cache[key]
+                key_etag_from_cache = True
             else:
                 try:
-                    current_key = self._s3.head_object(bucket=self._config.s3_bucket, key=key_path)
+                    current_key = self._s3.head_object(bucket=self._bucket, key=key_path)
                     current_key_etag = HeadObjectOutputs.key_object_etag(current_key)
                 except ClientError as e:  # type: ignore[misc]
                     if get_error_code(e) in ["NoSuchKey", "404"]:
@@ -277,7 +356,9 @@ class ImmuKVClient(Generic[K, V]):
             timestamp_ms: TimestampMs[K] = timestamp_now()
 
             # Step 3: Encode value and calculate hash
+            # The value is serialized once and reused for the hash input and both bodies
             encoded_value: JSONValue = self._value_encoder(value)
+            value_json = dumps_canonical(encoded_value)
             entry_for_hash: LogEntryForHash[K, JSONValue] = {
                 "sequence": new_sequence,
                 "key": key,
@@ -285,7 +366,7 @@ class ImmuKVClient(Generic[K, V]):
                 "timestamp_ms": timestamp_ms,
                 "previous_hash": prev_hash,
             }
-            entry_hash = self._calculate_hash(entry_for_hash)
+            entry_hash = self._calculate_hash(entry_for_hash, value_json)
 
             # Step 4: Create complete log entry (with current key object ETag)
             log_entry: LogEntryDict = {
@@ -293,36 +374,59 @@ class ImmuKVClient(Generic[K, V]):
                 "key": key,
                 "value": encoded_value,
                 "timestamp_ms": timestamp_ms,
-                "previous_version_id": prev_version_id,
                 "previous_hash": prev_hash,
                 "hash": entry_hash,
-                "previous_key_object_etag": current_key_etag,
             }
+            # Optional fields are omitted when None to match TypeScript's undefined behavior
+            if prev_version_id is not None:
+                log_entry["previous_version_id"] = prev_version_id
+            if current_key_etag is not None:
+                log_entry["previous_key_object_etag"] = current_key_etag
 
             # Step 5: Write to log with optimistic locking
             try:
-                # Strip None values to match TypeScript's undefined behavior (omits field from JSON)
-                log_entry_for_json = strip_none_values(cast(Dict[str, JSONValue], log_entry))
-
-                if log_etag is not None:
-                    # Update existing log - use IfMatch
-                    response = self._s3.put_object(
-                        bucket=self._config.s3_bucket,
-                        key=self._log_key,
-                        body=dumps_canonical(cast(JSONValue, log_entry_for_json)),
-                        content_type="application/json",
-                        if_match=log_etag,
-                    )
-                else:
-                    # First write - use if_none_match='*'
-                    response = self._s3.put_object(
-                        bucket=self._config.s3_bucket,
-                        key=self._log_key,
-                        body=dumps_canonical(cast(JSONValue, log_entry_for_json)),
-                        content_type="application/json",
-                        if_none_match="*",
-                    )
+                log_body = dumps_canonical_with_value(log_entry, value_json)
+
+                # Update existing log - use IfMatch; first write - use if_none_match='*'
+                # Each attempt is tagged so an SDK-retried request can recognize its own write
+                write_id = uuid.uuid4().hex
+                log_write = self._s3.submit_put_object(
+                    bucket=self._bucket,
+                    key=self._log_key,
+                    body=log_body,
+                    content_type="application/json",
+                    if_match=log_etag,
+                    if_none_match="*" if log_etag is None else None,
+                    metadata={WRITE_ID_METADATA_KEY: write_id},
+                )
+
+                # While the log write is in flight, prepare the key object body
+                # (INCLUDES ALL FIELDS FROM LOG ENTRY) around the log version ID
+                key_fields: Dict[str, JSONValue] = {
+                    "sequence": new_sequence,
+                    "key": key,
+                    "timestamp_ms": timestamp_ms,
+                    "hash": entry_hash,
+                    "previous_hash": prev_hash,
+                }
+                key_body_head, key_body_tail = dumps_canonical_around(
+                    key_fields, "log_version_id", value_json
+                )
 
+                try:
+                    response = log_write.result()
+                except ClientError as e:  # type: ignore[misc]
+                    # When the response to a successful write is lost, the SDK's retry of
+                    # the same request fails its precondition against that very write.
+                    # Without a retry, the conflict is another writer's: skip the check.
+                    own_write = (
+                        self._find_own_log_write(write_id)
+                        if get_error_code(e) == "PreconditionFailed" and get_retry_attempts(e) > 0
+                        else None
+                    )
+                    if own_write is None:
+                        raise
+                    response = own_write
                 new_log_version_id_opt: Optional[LogVersionId[K]] = PutObjectOutputs.log_version_id(
                     response
                 )
@@ -331,6 +435,8 @@ class ImmuKVClient(Generic[K, V]):
                         "S3 response missing VersionId - versioning must be enabled on bucket"
                     )
                 new_log_version_id: LogVersionId[K] = new_log_version_id_opt
+                new_log_etag = response["ETag"]
+                self._last_written_log_version_id = new_log_version_id
                 break  # Committed to log! Exit retry loop
 
             except ClientError as e:  # type: ignore[misc]
@@ -359,45 +465,49 @@ class ImmuKVClient(Generic[K, V]):
 
         # ===== Write Phase 2: Write Key Object (with conditional write) =====
 
-        key_object_etag: Optional[KeyObjectETag[K]] = None
-        try:
-            # Create key object data - INCLUDES ALL FIELDS FROM LOG ENTRY
-            key_data: KeyObjectDict = {
-                "sequence": new_sequence,
-                "key": key,
-                "value": encoded_value,
-                "timestamp_ms": timestamp_ms,
-                "log_version_id": new_log_version_id,
-                "hash": entry_hash,
-                "previous_hash": prev_hash,
-            }
+        key_body = key_body_head + dumps_canonical(new_log_version_id) + key_body_tail
 
-            if current_key_etag is not None:
-                # UPDATE existing key object - use IfMatch
-                response = self._s3.put_object(
-                    bucket=self._config.s3_bucket,
-                    key=key_path,
-                    body=dumps_canonical(cast(JSONValue, key_data)),
-                    content_type="application/json",
-                    if_match=current_key_etag,
-                )
-                key_object_etag = PutObjectOutputs.key_object_etag(response)
-            else:
-                # CREATE new key object - use if_none_match='*'
-                response = self._s3.put_object(
-                    bucket=self._config.s3_bucket,
-                    key=key_path,
-                    body=dumps_canonical(cast(JSONValue, key_data)),
-                    content_type="application/json",
-                    if_none_match="*",
+        key_object_etag: Optional[KeyObjectETag[K]] = None
+        if self._config.defer_key_object_write:
+            # Runs on the key writer thread; the next operation on this client waits for it
+            if self._key_writer is None:
+                self._key_writer = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="immukv-key-writer"
                 )
-                key_object_etag = PutObjectOutputs.key_object_etag(response)
-
-        except Exception as e:
-            logger.warning(
-                f"Failed to write key object for {key} (log version {new_log_version_id}): {e}. "
-                "Entry committed to log but key object missing (orphaned temporarily)."
+            self._pending_key_write = self._key_writer.submit(
+                self._write_key_object,
+                key,
+                key_path,
+                key_body,
+                current_key_etag,
+                key_etag_from_cache,
+                new_sequence,
+                new_log_version_id,
             )
+        else:
+            key_object_etag = self._write_key_object(
+                key,
+                key_path,
+                key_body,
+                current_key_etag,
+                key_etag_from_cache,
+                new_sequence,
+                new_log_version_id,
+            )
+
+        # Remember the resulting log state for the next set(), unless the key object
+        # write failed and left an orphan that the next pre-flight has to repair
+        if self._config.defer_key_object_write or key_object_etag is not None:
+            self._last_log_state = {
+                "log_etag": new_log_etag,
+                "prev_version_id": new_log_version_id,
+                "prev_hash": entry_hash,
+                "sequence": new_sequence,
+                "can_write": True,
+                "orphan_status": None,
+                "repaired_key": None,
+                "repaired_key_object_etag": None,
+            }
 
         # Step 6: Return Entry
         return Entry(
@@ -420,12 +530,13 @@ class ImmuKVClient(Generic[K, V]):
 
         Raises KeyNotFoundError if key object doesn't exist and no orphan fallback available.
         """
+        self._wait_for_pending_key_write()
+
         # Conditional orphan check based on time interval
-        current_time_ms = int(time.time() * 1000)
-        time_since_last_check = current_time_ms - self._last_repair_check_ms
+        current_time_ms = time.time_ns() // 1_000_000
 
         # Check if we need to perform orphan repair check
-        if time_since_last_check >= self._config.repair_check_interval_ms:
+        if current_time_ms >= self._next_repair_ms:
             # Skip repair attempt if we know we're read-only
             if self._can_write is not False and not self._config.read_only:
                 # Perform orphan check and repair
@@ -434,12 +545,15 @@ class ImmuKVClient(Generic[K, V]):
                     self._can_write = result["can_write"]
                 if result["orphan_status"] is not None:
                     self._latest_orphan_status = result["orphan_status"]
-                self._last_repair_check_ms = current_time_ms
+                self._next_repair_ms = current_time_ms + self._config.repair_check_interval_ms
+                if result["can_write"] is True:
+                    # The next set() can start from this log state
+                    self._last_log_state = result
 
         # Try to read from key object
-        key_path = S3KeyPaths.for_key(self._config.s3_prefix, key)
+        key_path = self._key_path(key)
         try:
-            response = self._s3.get_object(bucket=self._config.s3_bucket, key=key_path)
+            response = self._s3.get_object(bucket=self._bucket, key=key_path)
             data = read_body_as_json(response["Body"])
             return entry_from_key_object(data, self._value_decoder)
 
@@ -473,18 +587,36 @@ class ImmuKVClient(Generic[K, V]):
                 raise
 
     def get_log_version(self, version_id: LogVersionId[K]) -> Entry[K, V]:
-        """Get specific log version by S3 version ID."""
+        """Get specific log version by S3 version ID.
+
+        Log versions never change, so recently fetched bodies are served from a
+        bounded in-memory cache. The value is decoded afresh on every call.
+        """
+        body = self._log_body_cache.get(version_id)
+        if body is not None:
+            self._log_body_cache.move_to_end(version_id)
+            return entry_from_log(parse_json_bytes(body), version_id, self._value_decoder)
         try:
             response = self._s3.get_object(
-                bucket=self._config.s3_bucket, key=self._log_key, version_id=version_id
+                bucket=self._bucket, key=self._log_key, version_id=version_id
+            )
+            body = read_body_bytes(response["Body"])
+            entry: Entry[K, V] = entry_from_log(
+                parse_json_bytes(body), version_id, self._value_decoder
             )
-            data = read_body_as_json(response["Body"])
-            return entry_from_log(data, version_id, self._value_decoder)
         except ClientError as e:  # type: ignore[misc]
             if get_error_code(e) in ["NoSuchKey", "NoSuchVersion", "404"]:
                 raise KeyNotFoundError(f"Log version '{version_id}' not found")
             raise
 
+        if len(body) <= LOG_BODY_CACHE_MAX_BODY_BYTES:
+            self._log_body_cache[version_id] = body
+            self._log_body_cache_bytes += len(body)
+            while self._log_body_cache_bytes > LOG_BODY_CACHE_MAX_BYTES:
+                _, evicted = self._log_body_cache.popitem(last=False)
+                self._log_body_cache_bytes -= len(evicted)
+        return entry
+
     def history(
         self, key: K, before_version_id: Optional[KeyVersionId[K]], limit: Optional[int]
     ) -> Tuple[List[Entry[K, V]], Optional[KeyVersionId[K]]]:
@@ -501,7 +633,8 @@ class ImmuKVClient(Generic[K, V]):
         Returns:
             Tuple of (entries, oldest_key_version_id)
         """
-        key_path = S3KeyPaths.for_key(self._config.s3_prefix, key)
+        self._wait_for_pending_key_write()
+        key_path = self._key_path(key)
         entries: List[Entry[K, V]] = []
 
         # Check if we should prepend orphan entry
@@ -532,52 +665,60 @@ class ImmuKVClient(Generic[K, V]):
 
         # List versions of key object
         try:
-            key_marker: Optional[str] = key_path if before_version_id is not None else None
+            key_marker: Optional[S3KeyPath[K]] = key_path if before_version_id is not None else None
             version_id_marker: Optional[str] = before_version_id
             last_key_version_id: Optional[KeyVersionId[K]] = None
 
             while True:
-                list_params: Dict[str, Any] = {  # type: ignore[explicit-any]
-                    "bucket": self._config.s3_bucket,
-                    "prefix": key_path,
-                }
-                if key_marker is not None:
-                    list_params["KeyMarker"] = key_marker  # type: ignore[misc]
-                if version_id_marker is not None:
-                    list_params["VersionIdMarker"] = version_id_marker  # type: ignore[misc]
-
-                page = self._s3.list_object_versions(**list_params)  # type: ignore[misc]
+                page = self._s3.list_object_versions(
+                    bucket=self._bucket,
+                    prefix=key_path,
+                    key_marker=key_marker,
+                    version_id_marker=version_id_marker,
+                )
                 versions_result = page.get("Versions")
                 versions = versions_result if versions_result is not None else []
+
+                # Collect this page's versions (up to the remaining limit)
+                page_version_ids: List[KeyVersionId[K]] = []
+                past_key = False
                 for version in versions:
                     if version["Key"] != key_path:
-                        continue
+                        # Versions are listed in key order and key_path is the
+                        # smallest key with this prefix, so the rest belong to other keys
+                        past_key = True
+                        break
 
                     # Skip the before_version_id itself
                     if before_version_id is not None and version["VersionId"] == before_version_id:
                         continue
 
-                    # Fetch version data
-                    key_version_id: KeyVersionId[K] = ObjectVersions.key_version_id(version)
-                    response = self._s3.get_object(
-                        bucket=self._config.s3_bucket,
-                        key=key_path,
-                        version_id=key_version_id,
-                    )
+                    page_version_ids.append(ObjectVersions.key_version_id(version))
+                    if limit is not None and len(entries) + len(page_version_ids) >= limit:
+                        break
+
+                # Fetch version data (concurrently, results in listing order)
+                responses = self._s3.get_object_versions(
+                    bucket=self._bucket,
+                    key=key_path,
+                    version_ids=page_version_ids,
+                )
+                for key_version_id, response in zip(page_version_ids, responses):
                     data = read_body_as_json(response["Body"])
                     entry: Entry[K, V] = entry_from_key_object(data, self._value_decoder)
                     entries.append(entry)
                     last_key_version_id = key_version_id
 
-                    # Check limit
-                    if limit is not None and len(entries) >= limit:
-                        return (entries, last_key_version_id)
+                # Check limit
+                if limit is not None and len(entries) >= limit:
+                    return (entries, last_key_version_id)
 
-                # Check if more pages
-                if not page.get("IsTruncated", False):
+                # Check if more pages (of this key's versions)
+                if past_key or not page.get("IsTruncated", False):
                     break
 
-                key_marker = page.get("NextKeyMarker")
+                next_key_marker = page.get("NextKeyMarker")
+                key_marker = S3KeyPath(next_key_marker) if next_key_marker is not None else None
                 version_id_marker = page.get("NextVersionIdMarker")
 
         except ClientError as e:  # type: ignore[misc]
@@ -594,6 +735,73 @@ class ImmuKVClient(Generic[K, V]):
         )
         return (entries, oldest_key_version_id)
 
+    def history_version_ids(
+        self, key: K, before_version_id: Optional[KeyVersionId[K]], limit: Optional[int]
+    ) -> Tuple[List[KeyVersionId[K]], Optional[KeyVersionId[K]]]:
+        """Get the key object version IDs of a key (descending order - newest first).
+
+        Metadata-only counterpart of history(): uses the version listing alone and
+        fetches no version bodies. An orphan entry has no key object version and is
+        not included.
+
+        Args:
+            key: The key to list versions for
+            before_version_id: Return versions before this key version ID (exclusive).
+            limit: Maximum number of version IDs to return. Pass None for unlimited.
+
+        Returns:
+            Tuple of (version_ids, oldest_key_version_id), usable as before_version_id
+            for history() and history_version_ids()
+        """
+        self._wait_for_pending_key_write()
+        key_path = self._key_path(key)
+        version_ids: List[KeyVersionId[K]] = []
+
+        try:
+            key_marker: Optional[S3KeyPath[K]] = key_path if before_version_id is not None else None
+            version_id_marker: Optional[str] = before_version_id
+
+            while True:
+                page = self._s3.list_object_versions(
+                    bucket=self._bucket,
+                    prefix=key_path,
+                    key_marker=key_marker,
+                    version_id_marker=version_id_marker,
+                )
+                versions_result = page.get("Versions")
+                versions = versions_result if versions_result is not None else []
+
+                past_key = False
+                for version in versions:
+                    if version["Key"] != key_path:
+                        # Versions are listed in key order and key_path is the
+                        # smallest key with this prefix, so the rest belong to other keys
+                        past_key = True
+                        break
+
+                    # Skip the before_version_id itself
+                    if before_version_id is not None and version["VersionId"] == before_version_id:
+                        continue
+
+                    version_ids.append(ObjectVersions.key_version_id(version))
+                    if limit is not None and len(version_ids) >= limit:
+                        return (version_ids, version_ids[-1])
+
+                # Check if more pages (of this key's versions)
+                if past_key or not page.get("IsTruncated", False):
+                    break
+
+                next_key_marker = page.get("NextKeyMarker")
+                key_marker = S3KeyPath(next_key_marker) if next_key_marker is not None else None
+                version_id_marker = page.get("NextVersionIdMarker")
+
+        except ClientError as e:  # type: ignore[misc]
+            if get_error_code(e) in ["NoSuchKey", "404"]:
+                return ([], None)
+            raise
+
+        return (version_ids, version_ids[-1] if version_ids else None)
+
     def log_entries(
         self, before_version_id: Optional[LogVersionId[K]], limit: Optional[int]
     ) -> List[Entry[K, V]]:
@@ -609,50 +817,60 @@ class ImmuKVClient(Generic[K, V]):
         entries: List[Entry[K, V]] = []
 
         try:
-            key_marker: Optional[str] = self._log_key if before_version_id is not None else None
             version_id_marker: Optional[str] = before_version_id
+            key_marker: Optional[S3KeyPath[LogKey]] = (
+                self._log_key if before_version_id is not None else None
+            )
 
             while True:
-                list_params: Dict[str, Any] = {  # type: ignore[explicit-any]
-                    "bucket": self._config.s3_bucket,
-                    "prefix": self._log_key,
-                }
-                if key_marker is not None:
-                    list_params["KeyMarker"] = key_marker  # type: ignore[misc]
-                if version_id_marker is not None:
-                    list_params["VersionIdMarker"] = version_id_marker  # type: ignore[misc]
-
-                page = self._s3.list_object_versions(**list_params)  # type: ignore[misc]
+                page = self._s3.list_object_versions(
+                    bucket=self._bucket,
+                    prefix=self._log_key,
+                    key_marker=key_marker,
+                    version_id_marker=version_id_marker,
+                )
                 versions_result = page.get("Versions")
                 versions = versions_result if versions_result is not None else []
+
+                # Collect this page's versions (up to the remaining limit)
+                page_version_ids: List[LogVersionId[K]] = []
+                past_key = False
                 for version in versions:
                     if version["Key"] != self._log_key:
-                        continue
+                        # Versions are listed in key order and self._log_key is the
+                        # smallest key with this prefix, so the rest belong to other keys
+                        past_key = True
+                        break
 
                     # Skip the before_version_id itself
                     if before_version_id is not None and version["VersionId"] == before_version_id:
                         continue
 
-                    # Fetch version data
-                    response = self._s3.get_object(
-                        bucket=self._config.s3_bucket,
-                        key=self._log_key,
-                        version_id=version["VersionId"],
-                    )
+                    page_version_ids.append(ObjectVersions.log_version_id(version))
+                    if limit is not None and len(entries) + len(page_version_ids) >= limit:
+                        break
+
+                # Fetch version data (concurrently, results in listing order)
+                responses = self._s3.get_object_versions(
+                    bucket=self._bucket,
+                    key=self._log_key,
+                    version_ids=page_version_ids,
+                )
+                for version_id_log, response in zip(page_version_ids, responses):
                     data = read_body_as_json(response["Body"])
-                    version_id_log: LogVersionId[K] = ObjectVersions.log_version_id(version)
                     entry: Entry[K, V] = entry_from_log(data, version_id_log, self._value_decoder)
                     entries.append(entry)
 
-                    # Check limit
-                    if limit is not None and len(entries) >= limit:
-                        return entries
+                # Check limit
+                if limit is not None and len(entries) >= limit:
+                    return entries
 
-                # Check if more pages
-                if not page.get("IsTruncated", False):
+                # Check if more pages (of this key's versions)
+                if past_key or not page.get("IsTruncated", False):
                     break
 
-                key_marker = page.get("NextKeyMarker")
+                next_key_marker = page.get("NextKeyMarker")
+                key_marker = S3KeyPath(next_key_marker) if next_key_marker is not None else None
                 version_id_marker = page.get("NextVersionIdMarker")
 
         except ClientError as e:  # type: ignore[misc]
@@ -713,26 +931,30 @@ class ImmuKVClient(Generic[K, V]):
         Returns:
             List of key names in lexicographic order
         """
+        self._wait_for_pending_key_write()
         keys: List[K] = []
-        base_prefix = f"{self._config.s3_prefix}keys/"
+        base_prefix = self._keys_prefix
+        base_prefix_len = len(base_prefix)
         s3_prefix = f"{base_prefix}{prefix}" if prefix is not None else base_prefix
         start_after = f"{base_prefix}{after_key}.json" if after_key is not None else s3_prefix
 
         try:
             continuation_token: Optional[str] = None
             while True:
+                # Ask only for the keys still needed so S3 stops listing at the limit
                 page = self._s3.list_objects_v2(
-                    bucket=self._config.s3_bucket,
+                    bucket=self._bucket,
                     prefix=s3_prefix,
                     start_after=start_after if continuation_token is None else None,
                     continuation_token=continuation_token,
+                    max_keys=min(limit - len(keys), 1000) if limit is not None else None,
                 )
                 contents_raw = page.get("Contents")
                 contents = contents_raw if contents_raw is not None else []
                 for obj in contents:
-                    key_name_str = obj["Key"][len(base_prefix) :]
-                    if key_name_str.endswith(".json"):
-                        keys.append(cast(K, key_name_str[:-5]))
+                    object_key = obj["Key"]
+                    if object_key.endswith(".json"):
+                        keys.append(cast(K, object_key[base_prefix_len:-5]))
                         if limit is not None and len(keys) >= limit:
                             return keys
                 if not page["IsTruncated"]:
@@ -771,13 +993,8 @@ class ImmuKVClient(Generic[K, V]):
         if not entries:
             return True
 
-        # Verify each entry's hash
-        for entry in entries:
-            if not self._verify_raw(entry):
-                logger.error(f"Hash verification failed for entry {entry.sequence}")
-                return False
-
-        # Verify chain linkage (newest to oldest)
+        # Verify chain linkage first (newest to oldest): a string compare per
+        # entry, so a broken chain is reported without hashing anything
         for i in range(len(entries) - 1):
             current = entries[i]
             previous = entries[i + 1]
@@ -788,6 +1005,12 @@ class ImmuKVClient(Generic[K, V]):
                 )
                 return False
 
+        # Verify each entry's hash
+        for entry in entries:
+            if not self._verify_raw(entry):
+                logger.error(f"Hash verification failed for entry {entry.sequence}")
+                return False
+
         return True
 
     def _verify_raw(self, entry: RawEntry[K]) -> bool:
@@ -821,46 +1044,54 @@ class ImmuKVClient(Generic[K, V]):
         entries: List[RawEntry[K]] = []
 
         try:
-            key_marker: Optional[str] = None
+            key_marker: Optional[S3KeyPath[LogKey]] = None
             version_id_marker: Optional[str] = None
 
             while True:
-                list_params: Dict[str, Any] = {  # type: ignore[explicit-any]
-                    "bucket": self._config.s3_bucket,
-                    "prefix": self._log_key,
-                }
-                if key_marker is not None:
-                    list_params["KeyMarker"] = key_marker  # type: ignore[misc]
-                if version_id_marker is not None:
-                    list_params["VersionIdMarker"] = version_id_marker  # type: ignore[misc]
-
-                page = self._s3.list_object_versions(**list_params)  # type: ignore[misc]
+                page = self._s3.list_object_versions(
+                    bucket=self._bucket,
+                    prefix=self._log_key,
+                    key_marker=key_marker,
+                    version_id_marker=version_id_marker,
+                )
                 versions_result = page.get("Versions")
                 versions = versions_result if versions_result is not None else []
+
+                # Collect this page's versions (up to the remaining limit)
+                page_version_ids: List[LogVersionId[K]] = []
+                past_key = False
                 for version in versions:
                     if version["Key"] != self._log_key:
-                        continue
-
-                    # Fetch version data
-                    response = self._s3.get_object(
-                        bucket=self._config.s3_bucket,
-                        key=self._log_key,
-                        version_id=version["VersionId"],
-                    )
+                        # Versions are listed in key order and self._log_key is the
+                        # smallest key with this prefix, so the rest belong to other keys
+                        past_key = True
+                        break
+
+                    page_version_ids.append(ObjectVersions.log_version_id(version))
+                    if limit is not None and len(entries) + len(page_version_ids) >= limit:
+                        break
+
+                # Fetch version data (concurrently, results in listing order)
+                responses = self._s3.get_object_versions(
+                    bucket=self._bucket,
+                    key=self._log_key,
+                    version_ids=page_version_ids,
+                )
+                for version_id_log, response in zip(page_version_ids, responses):
                     data = read_body_as_json(response["Body"])
-                    version_id_log: LogVersionId[K] = ObjectVersions.log_version_id(version)
                     entry: RawEntry[K] = raw_entry_from_log(data, version_id_log)
                     entries.append(entry)
 
-                    # Check limit
-                    if limit is not None and len(entries) >= limit:
-                        return entries
+                # Check limit
+                if limit is not None and len(entries) >= limit:
+                    return entries
 
-                # Check if more pages
-                if not page.get("IsTruncated", False):
+                # Check if more pages (of this key's versions)
+                if past_key or not page.get("IsTruncated", False):
                     break
 
-                key_marker = page.get("NextKeyMarker")
+                next_key_marker = page.get("NextKeyMarker")
+                key_marker = S3KeyPath(next_key_marker) if next_key_marker is not None else None
                 version_id_marker = page.get("NextVersionIdMarker")
 
         except ClientError as e:  # type: ignore[misc]
@@ -888,18 +1119,33 @@ class ImmuKVClient(Generic[K, V]):
         new_client._thread = self._thread  # shared
         new_client._exit_stack = self._exit_stack  # shared
         new_client._owns_loop = False  # does NOT own cleanup
+        new_client._bucket = self._bucket
+        new_client._keys_prefix = self._keys_prefix
         new_client._log_key = self._log_key
         # Set new codec
         new_client._value_decoder = value_decoder
         new_client._value_encoder = value_encoder
         # Initialize mutable state
-        new_client._last_repair_check_ms = 0
+        new_client._next_repair_ms = 0
         new_client._can_write = None
         new_client._latest_orphan_status = None
+        new_client._key_etag_cache = {}
+        new_client._existing_key_objects = set()
+        new_client._log_body_cache = OrderedDict()
+        new_client._log_body_cache_bytes = 0
+        new_client._key_writer = None
+        new_client._pending_key_write = None
+        new_client._last_log_state = None
+        new_client._last_written_log_version_id = None
         return new_client
 
     def close(self) -> None:
         """Close client and cleanup resources."""
+        self._wait_for_pending_key_write()
+        if self._key_writer is not None:
+            self._key_writer.shutdown()
+            self._key_writer = None
+
         if not self._owns_loop:
             return  # with_codec() fork -- don't clean up shared resources
 
@@ -923,7 +1169,13 @@ class ImmuKVClient(Generic[K, V]):
 
     # ===== Private Helper Methods =====
 
-    def _calculate_hash(self, entry_for_hash: LogEntryForHash[K, JSONValue]) -> Hash[K]:
+    def _key_path(self, key: K) -> S3KeyPath[K]:
+        """S3 path of the key object for key."""
+        return S3KeyPaths.for_key_in(self._keys_prefix, key)
+
+    def _calculate_hash(
+        self, entry_for_hash: LogEntryForHash[K, JSONValue], value_json: Optional[bytes] = None
+    ) -> Hash[K]:
         """Calculate SHA-256 hash for a log entry.
 
         Hash Input Fields (in exact order):
@@ -933,9 +1185,138 @@ class ImmuKVClient(Generic[K, V]):
         4. timestamp_ms - The timestamp in epoch milliseconds (integer)
         5. previous_hash - The hash from the previous entry (string)
 
-        Canonical String Format: <sequence>|<key>|<value_json>|<timestamp_ms>|<previous_hash>
+        The fields are serialized together as canonical JSON (sorted keys, minimal
+        separators, ASCII-escaped) and hashed in a single pass. The byte layout is
+        shared with the TypeScript client, so it must not change.
+
+        Pass value_json (canonical JSON of the value) when it is already serialized.
+        """
+        return hash_compute(entry_for_hash, value_json)
+
+    def _write_key_object(
+        self,
+        key: K,
+        key_path: S3KeyPath[K],
+        key_body: bytes,
+        current_key_etag: Optional[KeyObjectETag[K]],
+        key_etag_from_cache: bool,
+        sequence: Sequence[K],
+        log_version_id: LogVersionId[K],
+    ) -> Optional[KeyObjectETag[K]]:
+        """Write Phase 2 of set(): propagate a committed log entry to its key object.
+
+        Failures are logged, not raised - the entry is already committed to the log
+        and is repaired as an orphan on a later write.
+
+        Returns:
+            ETag of the newly written key object, or None if it was not written
         """
-        return hash_compute(entry_for_hash)
+        try:
+            try:
+                key_object_etag = self._put_key_object(key_path, key_body, current_key_etag)
+            except ClientError as e:  # type: ignore[misc]
+                if not key_etag_from_cache or get_error_code(e) != "PreconditionFailed":
+                    raise
+                # Cached ETag is stale (key object written by another client)
+                self._key_etag_cache.pop(key, None)
+                retry_etag = self._retry_stale_key_object_write(key_path, key_body, sequence)
+                if retry_etag is None:
+                    return None
+                key_object_etag = retry_etag
+
+            self._key_etag_cache[key] = key_object_etag
+            self._existing_key_objects.add(key)
+            return key_object_etag
+
+        except Exception as e:
+            self._key_etag_cache.pop(key, None)
+            logger.warning(
+                f"Failed to write key object for {key} (log version {log_version_id}): {e}. "
+                "Entry committed to log but key object missing (orphaned temporarily)."
+            )
+            return None
+
+    def _wait_for_pending_key_write(self) -> None:
+        """Block until a deferred key object write (if any) has finished."""
+        if self._pending_key_write is not None:
+            if self._pending_key_write.result() is None:
+                # Key object not written - the log state cached by set() has an orphan
+                self._last_log_state = None
+            self._pending_key_write = None
+
+    def _put_key_object(
+        self,
+        key_path: S3KeyPath[K],
+        body: bytes,
+        current_key_etag: Optional[KeyObjectETag[K]],
+    ) -> KeyObjectETag[K]:
+        """Write key object conditionally on its current ETag.
+
+        Uses if_match when the key object is expected to exist, if_none_match='*'
+        when it is expected to be absent.
+
+        Returns:
+            ETag of the newly written key object
+        """
+        if current_key_etag is not None:
+            # UPDATE existing key object - use IfMatch
+            response = self._s3.put_object(
+                bucket=self._bucket,
+                key=key_path,
+                body=body,
+                content_type="application/json",
+                if_match=current_key_etag,
+            )
+        else:
+            # CREATE new key object - use if_none_match='*'
+            response = self._s3.put_object(
+                bucket=self._bucket,
+                key=key_path,
+                body=body,
+                content_type="application/json",
+                if_none_match="*",
+            )
+        return PutObjectOutputs.key_object_etag(response)
+
+    def _retry_stale_key_object_write(
+        self, key_path: S3KeyPath[K], body: bytes, sequence: Sequence[K]
+    ) -> Optional[KeyObjectETag[K]]:
+        """Retry a key object write once after a cached ETag turned out to be stale.
+
+        Re-reads the key object and only overwrites it while it still holds an older
+        entry, so a newer entry written by another client is never replaced.
+
+        Returns:
+            ETag of the newly written key object, or None if a newer entry is present
+        """
+        current_key_etag: Optional[KeyObjectETag[K]] = None
+        try:
+            response = self._s3.get_object(bucket=self._bucket, key=key_path)
+            data = read_body_as_json(response["Body"])
+            if get_int(data, "sequence") >= sequence:
+                return None
+            current_key_etag = GetObjectOutputs.key_object_etag(response)
+        except ClientError as e:  # type: ignore[misc]
+            if get_error_code(e) not in ["NoSuchKey", "404"]:
+                raise
+        return self._put_key_object(key_path, body, current_key_etag)
+
+    def _find_own_log_write(self, write_id: str) -> Optional[PutObjectOutput[LogKey]]:
+        """Check whether the current log version was written by the given set() attempt.
+
+        Returns:
+            The log version's ETag and VersionId if its write ID matches, otherwise None
+        """
+        try:
+            head = self._s3.head_object(bucket=self._bucket, key=self._log_key)
+        except ClientError as e:  # type: ignore[misc]
+            if get_error_code(e) in ["NoSuchKey", "404"]:
+                return None
+            raise
+        if head.get("Metadata", {}).get(WRITE_ID_METADATA_KEY) != write_id:
+            return None
+        logger.debug("Log write conflict was a retry of this client's own successful write")
+        return {"ETag": head["ETag"], "VersionId": head["VersionId"]}
 
     def _get_latest_and_repair(self) -> LatestLogState[K]:
         """Get latest log state and repair orphaned entry if needed.
@@ -952,8 +1333,8 @@ class ImmuKVClient(Generic[K, V]):
         """
         # Try to read current log
         try:
-            response = self._s3.get_object(bucket=self._config.s3_bucket, key=self._log_key)
-            log_etag = cast(str, response["ETag"])
+            response = self._s3.get_object(bucket=self._bucket, key=self._log_key)
+            log_etag = response["ETag"]
             current_version_id: LogVersionId[K] = LogVersionId(response["VersionId"])
             data = read_body_as_json(response["Body"])
 
@@ -964,6 +1345,13 @@ class ImmuKVClient(Generic[K, V]):
             # Create raw entry from latest log data (no value decoding)
             latest_entry: RawEntry[K] = raw_entry_from_log(data, current_version_id)
 
+            # Another writer has appended to the log since this client's last set(), so
+            # any key object ETag seen before may be stale. Writing a stale ETag into a
+            # log entry as previous_key_object_etag would make its orphan unrepairable.
+            # Only these write-side ETags are dropped; _existing_key_objects stays valid.
+            if current_version_id != self._last_written_log_version_id:
+                self._key_etag_cache.clear()
+
             # Try to repair orphan
             can_write, orphan_status, repaired_etag = self._repair_orphan(latest_entry)
 
@@ -1008,16 +1396,19 @@ class ImmuKVClient(Generic[K, V]):
         """
         # Skip if in read-only mode or we know we can't write
         if self._config.read_only or self._can_write is False:
-            # Check if this key object exists
-            key_path = S3KeyPaths.for_key(self._config.s3_prefix, latest_log.key)
+            # Check if this key object exists. Key objects are never deleted, so a key
+            # already known to exist needs no head_object - even after the log has moved.
+            key_path = self._key_path(latest_log.key)
             try:
-                self._s3.head_object(bucket=self._config.s3_bucket, key=key_path)
+                if latest_log.key not in self._existing_key_objects:
+                    self._s3.head_object(bucket=self._bucket, key=key_path)
+                    self._existing_key_objects.add(latest_log.key)
                 # Key object exists - not orphaned
                 orphan_status: OrphanStatus[K] = {
                     "is_orphaned": False,
                     "orphan_key": None,
                     "orphan_entry": None,
-                    "checked_at": int(time.time() * 1000),
+                    "checked_at": time.time_ns() // 1_000_000,
                 }
                 return (self._can_write, orphan_status, None)
             except ClientError as e:  # type: ignore[misc]
@@ -1027,13 +1418,13 @@ class ImmuKVClient(Generic[K, V]):
                         "is_orphaned": True,
                         "orphan_key": latest_log.key,
                         "orphan_entry": latest_log,
-                        "checked_at": int(time.time() * 1000),
+                        "checked_at": time.time_ns() // 1_000_000,
                     }
                     return (False, orphan_status, None)
                 raise
 
-        current_time_ms = int(time.time() * 1000)
-        key_path = S3KeyPaths.for_key(self._config.s3_prefix, latest_log.key)
+        current_time_ms = time.time_ns() // 1_000_000
+        key_path = self._key_path(latest_log.key)
 
         # Prepare repair data - use raw JSON value directly (no encode/decode round-trip)
         repair_data: KeyObjectDict = {
@@ -1050,7 +1441,7 @@ class ImmuKVClient(Generic[K, V]):
             if latest_log.previous_key_object_etag is not None:
                 # UPDATE with if_match=<previous_etag>
                 response = self._s3.put_object(
-                    bucket=self._config.s3_bucket,
+                    bucket=self._bucket,
                     key=key_path,
                     body=dumps_canonical(cast(JSONValue, repair_data)),
                     content_type="application/json",
@@ -1060,7 +1451,7 @@ class ImmuKVClient(Generic[K, V]):
             else:
                 # CREATE with if_none_match='*'
                 response = self._s3.put_object(
-                    bucket=self._config.s3_bucket,
+                    bucket=self._bucket,
                     key=key_path,
                     body=dumps_canonical(cast(JSONValue, repair_data)),
                     content_type="application/json",
@@ -1070,6 +1461,8 @@ class ImmuKVClient(Generic[K, V]):
 
             # Capture the key object ETag from the put_object response
             repaired_etag: KeyObjectETag[K] = PutObjectOutputs.key_object_etag(response)
+            self._key_etag_cache[latest_log.key] = repaired_etag
+            self._existing_key_objects.add(latest_log.key)
 
             # Success
             orphan_status = {
@@ -1085,6 +1478,7 @@ class ImmuKVClient(Generic[K, V]):
 
             if error_code == "PreconditionFailed":
                 # Already propagated by another client
+                self._key_etag_cache.pop(latest_log.key, None)
                 orphan_status = {
                     "is_orphaned": False,
                     "orphan_key": None,
@@ -2,7 +2,10 @@
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Awaitable, Callable, Generic, Optional, TypeVar, Union
+from typing import TYPE_CHECKING, Awaitable, Callable, Generic, Optional, TypeVar, Union
+
+if TYPE_CHECKING:
+    from botocore.config import Config as BotocoreConfig
 
 # Type variables for generic key and value types
 K = TypeVar("K", bound=str)  # Key type must be a subtype of str
@@ -11,16 +14,17 @@ V = TypeVar("V")  # Value type can be anything
 
 # Nominal types parameterized by key type
 # These are nominal types to prevent mixing version IDs from different contexts
+# Empty __slots__ keeps instances free of a per-instance __dict__
 class LogVersionId(str, Generic[K]):
     """Version ID for an entry in the global log for key K."""
 
-    pass
+    __slots__ = ()
 
 
 class KeyVersionId(str, Generic[K]):
     """Version ID for the key object file keys/{K}.json."""
 
-    pass
+    __slots__ = ()
 
 
 class KeyObjectETag(str, Generic[K]):
@@ -31,7 +35,7 @@ class KeyObjectETag(str, Generic[K]):
     Used with IfMatch for update, IfNoneMatch='*' for create.
     """
 
-    pass
+    __slots__ = ()
 
 
 class Hash(str, Generic[K]):
@@ -41,7 +45,7 @@ class Hash(str, Generic[K]):
     Forms a chain: each entry's hash includes the previous entry's hash.
     """
 
-    pass
+    __slots__ = ()
 
 
 class Sequence(int, Generic[K]):
@@ -50,13 +54,13 @@ class Sequence(int, Generic[K]):
     Client-maintained counter that increments with each write.
     """
 
-    pass
+    __slots__ = ()
 
 
 class TimestampMs(int, Generic[K]):
     """Unix epoch timestamp in milliseconds for an entry associated with key K."""
 
-    pass
+    __slots__ = ()
 
 
 @dataclass
@@ -86,6 +90,10 @@ class S3Overrides:
     # Use path-style URLs instead of virtual-hosted style (required for MinIO)
     force_path_style: bool = False
 
+    # botocore client configuration (connection pool size, timeouts, retries, ...).
+    # force_path_style is applied on top of it.
+    botocore_config: Optional["BotocoreConfig"] = None
+
 
 @dataclass
 class Config:
@@ -105,6 +113,10 @@ class Config:
     # Optional: read-only mode (disables all repair attempts)
     read_only: bool = False  # If True, never attempt to write key objects
 
+    # Optional: return from set() once the log entry is committed and write the key
+    # object in the background. The next operation on the client waits for it.
+    defer_key_object_write: bool = False
+
     # Optional: override default S3 client behavior
     overrides: Optional[S3Overrides] = None
 
@@ -0,0 +1,16 @@
+"""Shared pytest configuration for the immukv test suite."""
+
+import os
+from typing import List
+
+import pytest
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
+    """Skip tests marked `s3` unless a real S3 endpoint is configured."""
+    if os.getenv("IMMUKV_INTEGRATION_TEST") == "true":
+        return
+    skip_s3 = pytest.mark.skip(reason="Integration tests require IMMUKV_INTEGRATION_TEST=true")
+    for item in items:
+        if item.get_closest_marker("s3") is not None:
+            item.add_marker(skip_s3)
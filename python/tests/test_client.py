@@ -9,13 +9,13 @@ import concurrent.futures
 import os
 import uuid
 from collections.abc import Coroutine
-from contextlib import AsyncExitStack
-from typing import TYPE_CHECKING, Generator, TypeVar, cast
+from typing import TYPE_CHECKING, Generator, List, TypeVar, cast
 
 import pytest
 
 if TYPE_CHECKING:
     from types_aiobotocore_s3.client import S3Client
+    from types_aiobotocore_s3.type_defs import ObjectIdentifierTypeDef
 
 from immukv import Config, ImmuKVClient
 from immukv._internal.types import RawEntry
@@ -44,7 +44,13 @@ def _aio_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     """Provide a background event loop for test fixtures."""
     import threading
 
-    loop = asyncio.new_event_loop()
+    loop: asyncio.AbstractEventLoop
+    try:
+        import uvloop
+
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
     thread = threading.Thread(target=loop.run_forever, name="test-io", daemon=True)
     thread.start()
     yield loop
@@ -62,24 +68,22 @@ def raw_s3(_aio_loop: asyncio.AbstractEventLoop) -> Generator["S3Client", None,
     access_key = os.getenv("AWS_ACCESS_KEY_ID", "test")
     secret_key = os.getenv("AWS_SECRET_ACCESS_KEY", "test")
 
-    async def _create() -> tuple["S3Client", AsyncExitStack]:
-        stack = AsyncExitStack()
+    async def _create() -> "S3Client":
         session = aiobotocore.session.get_session()
-        client: "S3Client" = await stack.enter_async_context(
-            session.create_client(
-                "s3",
-                endpoint_url=endpoint_url,
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
-                region_name="us-east-1",
-            )
-        )
-        return client, stack
+        # Enter the client directly; its own __aexit__ closes it at teardown
+        client: "S3Client" = await session.create_client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name="us-east-1",
+        ).__aenter__()
+        return client
 
     future = asyncio.run_coroutine_threadsafe(_create(), _aio_loop)
-    client, stack = future.result()
+    client = future.result()
     yield client
-    future_close = asyncio.run_coroutine_threadsafe(stack.aclose(), _aio_loop)
+    future_close = asyncio.run_coroutine_threadsafe(client.__aexit__(None, None, None), _aio_loop)
     future_close.result()
 
 
@@ -95,6 +99,42 @@ def _run_sync(coro: Coroutine[object, object, _T], loop: asyncio.AbstractEventLo
     return future.result()
 
 
+async def _create_versioned_bucket(raw_s3: "S3Client", bucket_name: str) -> None:
+    """Create a bucket with versioning enabled."""
+    await raw_s3.create_bucket(Bucket=bucket_name)
+    await raw_s3.put_bucket_versioning(
+        Bucket=bucket_name, VersioningConfiguration={"Status": "Enabled"}
+    )
+
+
+async def _delete_versioned_bucket(raw_s3: "S3Client", bucket_name: str) -> None:
+    """Delete all versions and delete markers, then the bucket itself.
+
+    Each listing page (up to 1000 entries) is removed with one delete_objects call.
+    """
+    while True:
+        response = await raw_s3.list_object_versions(Bucket=bucket_name)
+        objects: List["ObjectIdentifierTypeDef"] = [
+            {"Key": version["Key"], "VersionId": version["VersionId"]}  # type: ignore[misc]
+            for version in [
+                *response.get("Versions", []),  # type: ignore[misc]
+                *response.get("DeleteMarkers", []),  # type: ignore[misc]
+            ]
+        ]
+        if objects:
+            result = await raw_s3.delete_objects(
+                Bucket=bucket_name, Delete={"Objects": objects, "Quiet": True}
+            )
+            if result.get("Errors"):
+                raise RuntimeError(f"delete_objects failed: {result['Errors']}")
+
+        # Deleted versions drop out of the listing, so the next page starts over
+        if not response.get("IsTruncated", False):
+            break
+
+    await raw_s3.delete_bucket(Bucket=bucket_name)
+
+
 @pytest.fixture  # type: ignore[misc]
 def s3_bucket(
     raw_s3: "S3Client", _aio_loop: asyncio.AbstractEventLoop
@@ -102,47 +142,13 @@ def s3_bucket(
     """Create unique S3 bucket for each test - ensures complete isolation."""
     bucket_name = f"test-immukv-{uuid.uuid4().hex[:8]}"
 
-    # Create bucket
-    _run_sync(raw_s3.create_bucket(Bucket=bucket_name), _aio_loop)
-
-    # Enable versioning
-    _run_sync(
-        raw_s3.put_bucket_versioning(
-            Bucket=bucket_name, VersioningConfiguration={"Status": "Enabled"}
-        ),
-        _aio_loop,
-    )
+    # Setup and teardown each run as a single coroutine on the background loop
+    _run_sync(_create_versioned_bucket(raw_s3, bucket_name), _aio_loop)
 
     yield bucket_name
 
-    # Cleanup: Delete all versions, delete markers, then bucket
     try:
-        response = _run_sync(raw_s3.list_object_versions(Bucket=bucket_name), _aio_loop)
-
-        # Delete all versions
-        for version in response.get("Versions", []):  # type: ignore[misc,attr-defined]
-            _run_sync(
-                raw_s3.delete_object(
-                    Bucket=bucket_name,
-                    Key=version["Key"],  # type: ignore[misc]
-                    VersionId=version["VersionId"],  # type: ignore[misc]
-                ),
-                _aio_loop,
-            )
-
-        # Delete all delete markers
-        for marker in response.get("DeleteMarkers", []):  # type: ignore[misc,attr-defined]
-            _run_sync(
-                raw_s3.delete_object(
-                    Bucket=bucket_name,
-                    Key=marker["Key"],  # type: ignore[misc]
-                    VersionId=marker["VersionId"],  # type: ignore[misc]
-                ),
-                _aio_loop,
-            )
-
-        # Delete bucket
-        _run_sync(raw_s3.delete_bucket(Bucket=bucket_name), _aio_loop)
+        _run_sync(_delete_versioned_bucket(raw_s3, bucket_name), _aio_loop)
     except Exception as e:
         # Best effort cleanup - don't fail tests if cleanup fails
         print(f"Warning: Cleanup failed for bucket {bucket_name}: {e}")
@@ -240,6 +246,34 @@ def test_set_multiple_keys(client: ImmuKVClient[str, object]) -> None:
     assert client.get("key-c").value == {"value": "c"}
 
 
+def test_deferred_key_object_write(client: ImmuKVClient[str, object]) -> None:
+    """Test that deferred key object writes are visible to subsequent reads."""
+    import dataclasses
+
+    config = dataclasses.replace(client._config, defer_key_object_write=True)
+    deferred_client: ImmuKVClient[str, object] = ImmuKVClient(
+        config, identity_decoder, identity_encoder
+    )
+    with deferred_client as deferred:
+        entry1 = deferred.set("deferred-key", {"n": 1})
+        entry2 = deferred.set("deferred-key", {"n": 2})
+
+        # Key object ETag is not known when set() returns
+        assert entry2.previous_key_object_etag is None
+        assert entry2.previous_hash == entry1.hash
+
+        # Reads wait for the pending key object write
+        assert deferred.get("deferred-key").value == {"n": 2}
+        entries, _ = deferred.history("deferred-key", None, None)
+        assert [e.value for e in entries] == [{"n": 2}, {"n": 1}]
+
+        deferred.set("deferred-other", {"n": 3})
+
+    # close() flushed the last pending write
+    assert client.get("deferred-other").value == {"n": 3}
+    assert client.verify_log_chain()
+
+
 def test_history_single_key(client: ImmuKVClient[str, object]) -> None:
     """Test retrieving history for a single key."""
     # Write multiple versions
@@ -277,6 +311,56 @@ def test_history_with_limit(client: ImmuKVClient[str, object]) -> None:
     assert entries[2].value == {"value": 2}
 
 
+def test_history_pagination_with_before_version_id(client: ImmuKVClient[str, object]) -> None:
+    """Test paging through history using the returned oldest version ID."""
+    for i in range(5):
+        client.set("counter", {"value": i})
+
+    first_page, oldest_version = client.history("counter", None, 2)
+    assert oldest_version is not None
+    second_page, _ = client.history("counter", oldest_version, None)
+
+    assert [e.value for e in first_page] == [{"value": 4}, {"value": 3}]
+    assert [e.value for e in second_page] == [{"value": 2}, {"value": 1}, {"value": 0}]
+
+
+def test_history_ignores_keys_sharing_the_key_object_prefix(
+    client: ImmuKVClient[str, object],
+) -> None:
+    """Test that history stops at keys whose object path extends the requested one."""
+    client.set("sensor", {"v": 1})
+    client.set("sensor.json", {"v": "other"})
+    client.set("sensor", {"v": 2})
+
+    entries, _ = client.history("sensor", None, None)
+    assert [e.value for e in entries] == [{"v": 2}, {"v": 1}]
+
+    version_ids, _ = client.history_version_ids("sensor", None, None)
+    assert len(version_ids) == 2
+
+
+def test_history_version_ids(client: ImmuKVClient[str, object]) -> None:
+    """Test listing key version IDs without fetching entry bodies."""
+    for i in range(5):
+        client.set("counter", {"value": i})
+    client.set("counter-other", {"value": 0})
+
+    version_ids, oldest_version = client.history_version_ids("counter", None, None)
+    assert len(version_ids) == 5
+    assert oldest_version == version_ids[-1]
+
+    # The IDs page exactly like history()
+    first_ids, first_oldest = client.history_version_ids("counter", None, 2)
+    assert first_ids == version_ids[:2]
+    entries, _ = client.history("counter", first_oldest, None)
+    assert [e.value for e in entries] == [{"value": 2}, {"value": 1}, {"value": 0}]
+
+    rest_ids, _ = client.history_version_ids("counter", first_oldest, None)
+    assert rest_ids == version_ids[2:]
+
+    assert client.history_version_ids("nonexistent-key", None, None) == ([], None)
+
+
 def test_history_mixed_keys(client: ImmuKVClient[str, object]) -> None:
     """Test that history only returns entries for requested key."""
     # Mix writes to different keys
@@ -337,6 +421,20 @@ def test_log_entries_with_limit(client: ImmuKVClient[str, object]) -> None:
     assert entries[2].sequence == 2
 
 
+def test_log_entries_pagination_with_before_version_id(
+    client: ImmuKVClient[str, object],
+) -> None:
+    """Test paging through the log using the last entry's version ID."""
+    for i in range(5):
+        client.set(f"key-{i}", {"index": i})
+
+    first_page = client.log_entries(None, 2)
+    second_page = client.log_entries(first_page[-1].version_id, None)
+
+    assert [e.sequence for e in first_page] == [4, 3]
+    assert [e.sequence for e in second_page] == [2, 1, 0]
+
+
 def test_list_keys(client: ImmuKVClient[str, object]) -> None:
     """Test listing all keys."""
     # Write to multiple keys (not in alphabetical order)
@@ -854,16 +952,16 @@ def test_with_codec_has_independent_mutable_state(client: ImmuKVClient[str, obje
     )
 
     # Mutable state should be independent
-    assert derived_client._last_repair_check_ms == 0
+    assert derived_client._next_repair_ms == 0
     assert derived_client._can_write is None
     assert derived_client._latest_orphan_status is None
 
     # Modify original client's state
-    client._last_repair_check_ms = 12345
+    client._next_repair_ms = 12345
     client._can_write = True
 
     # Derived client should be unaffected
-    assert derived_client._last_repair_check_ms == 0
+    assert derived_client._next_repair_ms == 0
     assert derived_client._can_write is None
 
 
@@ -10,19 +10,19 @@ import json
 import os
 import uuid
 from collections.abc import Coroutine
-from contextlib import AsyncExitStack
-from typing import TYPE_CHECKING, Generator, TypeVar, cast
+from typing import TYPE_CHECKING, Generator, List, TypeVar, cast
 
 import pytest
 from botocore.exceptions import ClientError
 
 if TYPE_CHECKING:
     from types_aiobotocore_s3.client import S3Client
+    from types_aiobotocore_s3.type_defs import ObjectIdentifierTypeDef
 
 from immukv import Config, ImmuKVClient
 from immukv._internal.s3_client import BrandedS3Client
 from immukv._internal.s3_helpers import get_error_code, read_body_as_json
-from immukv._internal.s3_types import S3KeyPath
+from immukv._internal.s3_types import S3KeyPath, S3KeyPaths
 from immukv.json_helpers import JSONValue
 from immukv.types import Entry, S3Credentials, S3Overrides
 
@@ -48,7 +48,13 @@ def _aio_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     """Provide a background event loop for test fixtures."""
     import threading
 
-    loop = asyncio.new_event_loop()
+    loop: asyncio.AbstractEventLoop
+    try:
+        import uvloop
+
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
     thread = threading.Thread(target=loop.run_forever, name="test-io", daemon=True)
     thread.start()
     yield loop
@@ -66,24 +72,22 @@ def raw_s3(_aio_loop: asyncio.AbstractEventLoop) -> Generator["S3Client", None,
     access_key = os.getenv("AWS_ACCESS_KEY_ID", "test")
     secret_key = os.getenv("AWS_SECRET_ACCESS_KEY", "test")
 
-    async def _create() -> tuple["S3Client", AsyncExitStack]:
-        stack = AsyncExitStack()
+    async def _create() -> "S3Client":
         session = aiobotocore.session.get_session()
-        client: "S3Client" = await stack.enter_async_context(
-            session.create_client(
-                "s3",
-                endpoint_url=endpoint_url,
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
-                region_name="us-east-1",
-            )
-        )
-        return client, stack
+        # Enter the client directly; its own __aexit__ closes it at teardown
+        client: "S3Client" = await session.create_client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name="us-east-1",
+        ).__aenter__()
+        return client
 
     future = asyncio.run_coroutine_threadsafe(_create(), _aio_loop)
-    client, stack = future.result()
+    client = future.result()
     yield client
-    future_close = asyncio.run_coroutine_threadsafe(stack.aclose(), _aio_loop)
+    future_close = asyncio.run_coroutine_threadsafe(client.__aexit__(None, None, None), _aio_loop)
     future_close.result()
 
 
@@ -105,6 +109,42 @@ def s3_client(raw_s3: "S3Client", _aio_loop: asyncio.AbstractEventLoop) -> Brand
     return BrandedS3Client(raw_s3, _aio_loop)
 
 
+async def _create_versioned_bucket(raw_s3: "S3Client", bucket_name: str) -> None:
+    """Create a bucket with versioning enabled."""
+    await raw_s3.create_bucket(Bucket=bucket_name)
+    await raw_s3.put_bucket_versioning(
+        Bucket=bucket_name, VersioningConfiguration={"Status": "Enabled"}
+    )
+
+
+async def _delete_versioned_bucket(raw_s3: "S3Client", bucket_name: str) -> None:
+    """Delete all versions and delete markers, then the bucket itself.
+
+    Each listing page (up to 1000 entries) is removed with one delete_objects call.
+    """
+    while True:
+        response = await raw_s3.list_object_versions(Bucket=bucket_name)
+        objects: List["ObjectIdentifierTypeDef"] = [
+            {"Key": version["Key"], "VersionId": version["VersionId"]}  # type: ignore[misc]
+            for version in [
+                *response.get("Versions", []),  # type: ignore[misc]
+                *response.get("DeleteMarkers", []),  # type: ignore[misc]
+            ]
+        ]
+        if objects:
+            result = await raw_s3.delete_objects(
+                Bucket=bucket_name, Delete={"Objects": objects, "Quiet": True}
+            )
+            if result.get("Errors"):
+                raise RuntimeError(f"delete_objects failed: {result['Errors']}")
+
+        # Deleted versions drop out of the listing, so the next page starts over
+        if not response.get("IsTruncated", False):
+            break
+
+    await raw_s3.delete_bucket(Bucket=bucket_name)
+
+
 @pytest.fixture  # type: ignore[misc]
 def s3_bucket(
     raw_s3: "S3Client", _aio_loop: asyncio.AbstractEventLoop
@@ -112,47 +152,13 @@ def s3_bucket(
     """Create unique S3 bucket for each test - ensures complete isolation."""
     bucket_name = f"test-immukv-{uuid.uuid4().hex[:8]}"
 
-    # Create bucket
-    _run_sync(raw_s3.create_bucket(Bucket=bucket_name), _aio_loop)
-
-    # Enable versioning
-    _run_sync(
-        raw_s3.put_bucket_versioning(
-            Bucket=bucket_name, VersioningConfiguration={"Status": "Enabled"}
-        ),
-        _aio_loop,
-    )
+    # Setup and teardown each run as a single coroutine on the background loop
+    _run_sync(_create_versioned_bucket(raw_s3, bucket_name), _aio_loop)
 
     yield bucket_name
 
-    # Cleanup: Delete all versions, delete markers, then bucket
     try:
-        response = _run_sync(raw_s3.list_object_versions(Bucket=bucket_name), _aio_loop)
-
-        # Delete all versions
-        for version in response.get("Versions", []):  # type: ignore[misc,attr-defined]
-            _run_sync(
-                raw_s3.delete_object(
-                    Bucket=bucket_name,
-                    Key=version["Key"],  # type: ignore[misc]
-                    VersionId=version["VersionId"],  # type: ignore[misc]
-                ),
-                _aio_loop,
-            )
-
-        # Delete all delete markers
-        for marker in response.get("DeleteMarkers", []):  # type: ignore[misc,attr-defined]
-            _run_sync(
-                raw_s3.delete_object(
-                    Bucket=bucket_name,
-                    Key=marker["Key"],  # type: ignore[misc]
-                    VersionId=marker["VersionId"],  # type: ignore[misc]
-                ),
-                _aio_loop,
-            )
-
-        # Delete bucket
-        _run_sync(raw_s3.delete_bucket(Bucket=bucket_name), _aio_loop)
+        _run_sync(_delete_versioned_bucket(raw_s3, bucket_name), _aio_loop)
     except Exception as e:
         # Best effort cleanup - don't fail tests if cleanup fails
         print(f"Warning: Cleanup failed for bucket {bucket_name}: {e}")
@@ -211,7 +217,7 @@ def test_real_etag_generation_and_validation(
     entry = client.set("key1", {"data": "value"})
 
     # Get the key object and check ETag
-    key_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/key1.json")
+    key_path = S3KeyPaths.for_key(client._config.s3_prefix, "key1")
     response = s3_client.head_object(bucket=client._config.s3_bucket, key=key_path)
 
     etag: str = response["ETag"]
@@ -226,7 +232,7 @@ def test_conditional_write_if_match_succeeds(
     client.set("key1", {"version": 1})
 
     # Get current ETag
-    key_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/key1.json")
+    key_path = S3KeyPaths.for_key(client._config.s3_prefix, "key1")
     response = s3_client.head_object(bucket=client._config.s3_bucket, key=key_path)
     correct_etag = response["ETag"]
 
@@ -246,7 +252,7 @@ def test_conditional_write_if_match_fails(
     client.set("key1", {"version": 1})
 
     # Write with wrong ETag should fail
-    key_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/key1.json")
+    key_path = S3KeyPaths.for_key(client._config.s3_prefix, "key1")
     with pytest.raises(ClientError) as exc_info:  # type: ignore[misc]
         s3_client.put_object(
             bucket=client._config.s3_bucket,
@@ -263,7 +269,7 @@ def test_conditional_write_if_none_match_creates_new(
 ) -> None:
     """Verify IfNoneMatch='*' succeeds when key doesn't exist."""
     # Write with IfNoneMatch='*' should succeed for new key
-    key_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/new-key.json")
+    key_path = S3KeyPaths.for_key(client._config.s3_prefix, "new-key")
     s3_client.put_object(
         bucket=client._config.s3_bucket,
         key=key_path,
@@ -279,7 +285,7 @@ def test_conditional_write_if_none_match_fails_when_exists(
     client.set("existing-key", {"version": 1})
 
     # Write with IfNoneMatch='*' should fail
-    key_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/existing-key.json")
+    key_path = S3KeyPaths.for_key(client._config.s3_prefix, "existing-key")
     with pytest.raises(ClientError) as exc_info:  # type: ignore[misc]
         s3_client.put_object(
             bucket=client._config.s3_bucket,
@@ -301,7 +307,7 @@ def test_list_object_versions_returns_proper_order(
     entry3 = client.set("key1", {"version": 3})
 
     # List versions
-    prefix_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/key1.json")
+    prefix_path = S3KeyPaths.for_key(client._config.s3_prefix, "key1")
     response = s3_client.list_object_versions(bucket=client._config.s3_bucket, prefix=prefix_path)
 
     versions = response["Versions"]
@@ -319,23 +325,23 @@ def test_log_object_structure_matches_spec(
     entry = client.set("key1", {"data": "value"})
 
     # Read log object directly from S3
-    log_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}_log.json")
+    log_path = S3KeyPaths.for_log(client._config.s3_prefix)
     response = s3_client.get_object(bucket=client._config.s3_bucket, key=log_path, version_id=None)
 
     log_data = read_body_as_json(response["Body"])
 
     # Verify always-required fields
-    required_fields = [
+    required_fields = {
         "sequence",
         "key",
         "value",
         "timestamp_ms",
         "previous_hash",
         "hash",
-    ]
+    }
 
-    for field in required_fields:
-        assert field in log_data, f"Log object missing required field: {field}"
+    missing = required_fields - log_data.keys()
+    assert not missing, f"Log object missing required fields: {sorted(missing)}"
 
     # Optional fields should be omitted for genesis entry (None/undefined stripped)
     # previous_version_id and previous_key_object_etag are NotRequired[Optional[str]]
@@ -352,13 +358,13 @@ def test_key_object_structure_matches_spec(
     entry = client.set("key1", {"data": "value"})
 
     # Read key object directly from S3
-    key_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/key1.json")
+    key_path = S3KeyPaths.for_key(client._config.s3_prefix, "key1")
     response = s3_client.get_object(bucket=client._config.s3_bucket, key=key_path, version_id=None)
 
     key_data = read_body_as_json(response["Body"])
 
     # Verify required fields
-    required_fields = [
+    required_fields = {
         "sequence",
         "key",
         "value",
@@ -366,16 +372,16 @@ def test_key_object_structure_matches_spec(
         "log_version_id",
         "hash",
         "previous_hash",
-    ]
+    }
 
-    for field in required_fields:
-        assert field in key_data, f"Key object missing required field: {field}"
+    missing = required_fields - key_data.keys()
+    assert not missing, f"Key object missing required fields: {sorted(missing)}"
 
     # Verify excluded fields (per design doc)
-    excluded_fields = ["previous_version_id", "previous_key_object_etag"]
+    excluded_fields = {"previous_version_id", "previous_key_object_etag"}
 
-    for field in excluded_fields:
-        assert field not in key_data, f"Key object should not contain infrastructure field: {field}"
+    present = excluded_fields & key_data.keys()
+    assert not present, f"Key object should not contain infrastructure fields: {sorted(present)}"
 
 
 def test_none_values_omitted_from_json(s3_bucket: str, s3_client: BrandedS3Client) -> None:
@@ -524,7 +530,7 @@ def _create_orphan_log_entry(
     The log entry has correct hash chain and sequence, and records the current
     key object ETag as previous_key_object_etag (needed for repair).
     """
-    from immukv._internal.json_helpers import dumps_canonical
+    from immukv._internal.canonical import dumps_canonical
     from immukv._internal.types import (
         LogEntryForHash,
         hash_compute,
@@ -580,7 +586,7 @@ def test_repaired_etag_used_after_orphan_repair_end_to_end(
     assert entry1.value == {"version": 1}
 
     # Get current key object ETag (needed for orphan log entry)
-    key_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/x.json")
+    key_path = S3KeyPaths.for_key(client._config.s3_prefix, "x")
     head_response = s3_client.head_object(bucket=client._config.s3_bucket, key=key_path)
     current_key_etag = head_response["ETag"]
 
@@ -637,7 +643,7 @@ def test_repaired_etag_with_different_keys(
     assert entry_b.key == "b"
 
     # Get current key object ETag for "a" (needed for orphan log entry)
-    key_path_a = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/a.json")
+    key_path_a = S3KeyPaths.for_key(client._config.s3_prefix, "a")
     head_a = s3_client.head_object(bucket=client._config.s3_bucket, key=key_path_a)
     etag_a = head_a["ETag"]
 
@@ -684,7 +690,7 @@ def test_chain_integrity_maintained_after_orphan_repair(
     assert entry1.sequence == 0
 
     # Get current key object ETag
-    key_path = cast(S3KeyPath[str], f"{client._config.s3_prefix}keys/chain-key.json")
+    key_path = S3KeyPaths.for_key(client._config.s3_prefix, "chain-key")
     head_response = s3_client.head_object(bucket=client._config.s3_bucket, key=key_path)
     current_key_etag = head_response["ETag"]
 
@@ -1,8 +1,15 @@
 """Tests for JSON helper functions."""
 
+from typing import Dict, cast
+
 import pytest
 
-from immukv._internal.json_helpers import dumps_canonical
+from immukv._internal.canonical import (
+    dumps_canonical,
+    dumps_canonical_around,
+    dumps_canonical_with_value,
+)
+from immukv._internal.s3_helpers import read_body_as_json
 from immukv.json_helpers import JSONValue
 
 
@@ -112,6 +119,25 @@ def test_dumps_canonical_special_values() -> None:
     assert '"empty_object":{}' in decoded
 
 
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (1e-05, b"1e-05"),
+        (1e16, b"1e+16"),
+        (0.1, b"0.1"),
+        (float("nan"), b"NaN"),
+        ("\x7f", b'"\\u007f"'),
+    ],
+)
+def test_dumps_canonical_number_and_escape_format(value: JSONValue, expected: bytes) -> None:
+    """Test the exact float and escape format that stored bodies and hashes depend on.
+
+    orjson differs on every one of these cases (e.g. NaN becomes null and 1e-05
+    becomes 0.00001), which is why it is only used for parsing.
+    """
+    assert dumps_canonical(value) == expected
+
+
 def test_dumps_canonical_unicode() -> None:
     """Test that Unicode characters are escaped as ASCII."""
     data: JSONValue = {"message": "Hello 世界", "emoji": "🤖"}
@@ -184,3 +210,93 @@ def test_dumps_canonical_real_world_entry() -> None:
     # Check keys appear in sorted order by checking their positions
     positions = [decoded.index(f'"{k}":') for k in keys]
     assert positions == sorted(positions), "Keys should appear in alphabetical order"
+
+
+def test_dumps_canonical_with_value_matches_full_serialization() -> None:
+    """Test that splicing a pre-serialized value gives the same bytes as a full dump."""
+    value: JSONValue = {"nested": {"z": 1, "a": [1, 2.5, None]}, "text": "café"}
+    entry_data: dict[str, JSONValue] = {
+        "sequence": 7,
+        "key": "sensor-1",
+        "value": value,
+        "timestamp_ms": 1729765800000,
+        "log_version_id": "v1",
+        "previous_hash": "sha256:genesis",
+        "hash": "sha256:abc",
+    }
+
+    result = dumps_canonical_with_value(entry_data, dumps_canonical(value))
+
+    assert result == dumps_canonical(entry_data)
+
+
+def test_dumps_canonical_with_value_only_value() -> None:
+    """Test splicing when value is the only field."""
+    result = dumps_canonical_with_value({}, dumps_canonical([1, 2]))
+
+    assert result == b'{"value":[1,2]}'
+
+
+def test_dumps_canonical_with_value_rejects_fields_after_value() -> None:
+    """Test that field names sorting after 'value' are rejected."""
+    with pytest.raises(ValueError, match="sorts after 'value'"):
+        dumps_canonical_with_value({"zeta": 1}, b"1")
+
+
+@pytest.mark.parametrize("field", ["hash", "log_version_id", "timestamp_ms"])
+def test_dumps_canonical_around_matches_full_serialization(field: str) -> None:
+    """Test that filling the open field gives the same bytes as a full dump."""
+    value: JSONValue = {"b": [1, 2.5], "a": "café"}
+    entry_data: dict[str, JSONValue] = {
+        "sequence": 7,
+        "key": "sensor-1",
+        "value": value,
+        "timestamp_ms": 1729765800000,
+        "log_version_id": "v1",
+        "previous_hash": "sha256:genesis",
+        "hash": "sha256:abc",
+    }
+    fields = {k: v for k, v in entry_data.items() if k != field}
+
+    head, tail = dumps_canonical_around(fields, field, dumps_canonical(value))
+
+    assert head + dumps_canonical(entry_data[field]) + tail == dumps_canonical(entry_data)
+
+
+def test_dumps_canonical_around_rejects_fields_after_value() -> None:
+    """Test that an open field not sorting before 'value' is rejected."""
+    with pytest.raises(ValueError, match="does not sort before 'value'"):
+        dumps_canonical_around({"key": "k"}, "version", b"1")
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"key":"k","value":{"a":[1,2.5,null,true],"b":"caf\\u00e9"}}',
+        b'{"value":123456789012345678901234567890}',
+        b'{"value":-9223372036854775809}',
+        b'{"value":18446744073709551615}',
+        b'{"value":1e400}',
+    ],
+)
+def test_read_body_as_json_matches_json_loads(body: bytes) -> None:
+    """Test that body parsing matches json.loads exactly (including big integers)."""
+    import json
+    from io import BytesIO
+
+    expected = cast(Dict[str, JSONValue], json.loads(body))
+    result = read_body_as_json(BytesIO(body))
+
+    assert result == expected
+    assert [type(v) for v in result.values()] == [type(v) for v in expected.values()]
+
+
+def test_read_body_as_json_accepts_nan() -> None:
+    """Test that NaN written by dumps_canonical can be read back."""
+    import math
+    from io import BytesIO
+
+    result = read_body_as_json(BytesIO(dumps_canonical({"value": float("nan")})))
+
+    value = result["value"]
+    assert isinstance(value, float) and math.isnan(value)
@@ -4,9 +4,13 @@ These tests verify pure logic: hash computation, data validation,
 type checking, and other functionality that doesn't need S3.
 """
 
-from typing import TYPE_CHECKING
+import re
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, cast
 
+import aiobotocore.session
 import pytest
+from aiobotocore.credentials import AioDeferredRefreshableCredentials
 
 from immukv._internal.types import (
     LogEntryForHash,
@@ -28,84 +32,107 @@ from immukv.types import (
 
 # --- Hash Computation Tests ---
 
+# Lowercase hex digest of SHA-256 (bytes.fromhex would also accept uppercase)
+_LOWER_HEX_64 = re.compile(r"[0-9a-f]{64}")
 
-def test_hash_compute_format() -> None:
-    """Verify hash_compute returns 'sha256:' prefix with 64 hex characters."""
-    data: LogEntryForHash[str, object] = {
+
+@pytest.fixture(scope="module")
+def base_hash_data() -> LogEntryForHash[str, object]:
+    """Sample log entry data shared by the hash_compute tests."""
+    return {
         "sequence": sequence_from_json(0),
-        "key": "test-key",
-        "value": {"field": "value"},
-        "timestamp_ms": timestamp_from_json(1234567890000),
+        "key": "key",
+        "value": {"x": 1, "a": [1, 2]},
+        "timestamp_ms": timestamp_from_json(1000000000000),
         "previous_hash": hash_from_json("sha256:genesis"),
     }
 
-    result = hash_compute(data)
 
+@pytest.fixture(scope="module")
+def base_hash(base_hash_data: LogEntryForHash[str, object]) -> Hash[str]:
+    """Hash of base_hash_data."""
+    return hash_compute(base_hash_data)
+
+
+def test_hash_compute_format(base_hash: Hash[str]) -> None:
+    """Verify hash_compute returns 'sha256:' prefix with 64 hex characters."""
     # Must start with 'sha256:'
-    assert result.startswith("sha256:")
+    assert base_hash.startswith("sha256:")
 
     # Must be exactly 71 characters total (sha256: + 64 hex)
-    assert len(result) == 71
+    assert len(base_hash) == 71
 
     # Hex portion must be exactly 64 characters
-    hex_part = result[7:]  # After 'sha256:'
+    hex_part = base_hash[7:]  # After 'sha256:'
     assert len(hex_part) == 64
-    assert all(c in "0123456789abcdef" for c in hex_part)
-
-
-def test_hash_compute_deterministic() -> None:
-    """Verify hash_compute produces same hash for same input."""
-    data: LogEntryForHash[str, object] = {
-        "sequence": sequence_from_json(5),
-        "key": "key1",
-        "value": {"a": 1, "b": 2},
-        "timestamp_ms": timestamp_from_json(1000000000000),
-        "previous_hash": hash_from_json("sha256:abcd" + "0" * 60),
+    assert _LOWER_HEX_64.fullmatch(hex_part) is not None
+
+
+def test_hash_compute_deterministic(
+    base_hash_data: LogEntryForHash[str, object], base_hash: Hash[str]
+) -> None:
+    """Verify hash_compute produces same hash for same input, whatever the field order."""
+    reordered: LogEntryForHash[str, object] = {
+        "previous_hash": base_hash_data["previous_hash"],
+        "timestamp_ms": base_hash_data["timestamp_ms"],
+        "value": {"a": [1, 2], "x": 1},
+        "key": base_hash_data["key"],
+        "sequence": base_hash_data["sequence"],
     }
 
-    hash1 = hash_compute(data)
-    hash2 = hash_compute(data)
+    assert hash_compute(reordered) == base_hash
 
-    assert hash1 == hash2
 
-
-def test_hash_compute_changes_with_different_data() -> None:
+@pytest.mark.parametrize(
+    "field, new_value",
+    [
+        ("sequence", sequence_from_json(1)),
+        ("key", "different"),
+        ("value", {"x": 2}),
+        ("timestamp_ms", timestamp_from_json(2000000000000)),
+        ("previous_hash", hash_from_json("sha256:" + "1" * 64)),
+    ],
+)
+def test_hash_compute_changes_with_different_data(
+    base_hash_data: LogEntryForHash[str, object],
+    base_hash: Hash[str],
+    field: str,
+    new_value: object,
+) -> None:
     """Verify hash changes when any field changes."""
-    base_data: LogEntryForHash[str, object] = {
-        "sequence": sequence_from_json(0),
-        "key": "key",
-        "value": {"x": 1},
-        "timestamp_ms": timestamp_from_json(1000000000000),
-        "previous_hash": hash_from_json("sha256:genesis"),
-    }
+    data = cast(LogEntryForHash[str, object], {**base_hash_data, field: new_value})
+    assert hash_compute(data) != base_hash
 
-    base_hash = hash_compute(base_data)
 
-    # Change sequence
-    data_seq: LogEntryForHash[str, object] = {**base_data, "sequence": sequence_from_json(1)}
-    assert hash_compute(data_seq) != base_hash
+def test_hash_compute_known_value() -> None:
+    """Verify hash_compute output is pinned (hash chain format is shared across clients)."""
+    data: LogEntryForHash[str, object] = {
+        "sequence": sequence_from_json(3),
+        "key": "café",
+        "value": {"b": [1, 2.5, None, True], "a": "日本"},
+        "timestamp_ms": timestamp_from_json(1700000000000),
+        "previous_hash": hash_genesis(),
+    }
 
-    # Change key
-    data_key: LogEntryForHash[str, object] = {**base_data, "key": "different"}
-    assert hash_compute(data_key) != base_hash
+    assert (
+        hash_compute(data)
+        == "sha256:58944331440835f89305be0cbe5facd24047489f1483ae561d2ae8ab16a2038e"
+    )
 
-    # Change value
-    data_val: LogEntryForHash[str, object] = {**base_data, "value": {"x": 2}}
-    assert hash_compute(data_val) != base_hash
 
-    # Change timestamp
-    data_ts: LogEntryForHash[str, object] = {
-        **base_data,
-        "timestamp_ms": timestamp_from_json(2000000000000),
-    }
-    assert hash_compute(data_ts) != base_hash
+def test_hash_compute_with_pre_serialized_value() -> None:
+    """Verify passing the value's canonical JSON yields the same hash."""
+    from immukv._internal.canonical import dumps_canonical
 
-    # Change previous_hash
-    data_prev: LogEntryForHash[str, object] = {
-        **base_data,
-        "previous_hash": hash_from_json("sha256:" + "1" * 64),
+    data: LogEntryForHash[str, object] = {
+        "sequence": sequence_from_json(1),
+        "key": "key1",
+        "value": {"z": [1, 2], "a": "x"},
+        "timestamp_ms": timestamp_from_json(1000000000000),
+        "previous_hash": hash_genesis(),
     }
-    assert hash_compute(data_prev) != base_hash
+
+    assert hash_compute(data, dumps_canonical({"z": [1, 2], "a": "x"})) == hash_compute(data)
 
 
 def test_hash_genesis() -> None:
@@ -201,6 +228,7 @@ def test_config_optional_fields_defaults() -> None:
     assert config.overrides is None
     assert config.repair_check_interval_ms == 300000  # 5 minutes
     assert config.read_only is False
+    assert config.defer_key_object_write is False
 
 
 def test_config_with_all_optional_fields() -> None:
@@ -225,49 +253,35 @@ def test_config_with_all_optional_fields() -> None:
 # --- S3Credentials Tests ---
 
 
-def test_s3_credentials_without_session_token() -> None:
-    """Verify S3Credentials works without session token (backward-compatible)."""
-    creds = S3Credentials(
-        aws_access_key_id="AKID",
-        aws_secret_access_key="SECRET",
-    )
-
-    assert creds.aws_access_key_id == "AKID"
-    assert creds.aws_secret_access_key == "SECRET"
-    assert creds.aws_session_token is None
-
+@pytest.mark.parametrize("token", [None, "TOKEN"])
+@pytest.mark.parametrize("wrap_in_overrides", [False, True])
+def test_s3_credentials(token: Optional[str], wrap_in_overrides: bool) -> None:
+    """Verify S3Credentials with and without a session token, alone and in S3Overrides."""
+    if token is None:
+        # Session token omitted (backward-compatible)
+        creds = S3Credentials(aws_access_key_id="AKID", aws_secret_access_key="SECRET")
+    else:
+        # Session token for STS temporary credentials
+        creds = S3Credentials(
+            aws_access_key_id="AKID",
+            aws_secret_access_key="SECRET",
+            aws_session_token=token,
+        )
 
-def test_s3_credentials_with_session_token() -> None:
-    """Verify S3Credentials accepts aws_session_token for STS temporary credentials."""
-    creds = S3Credentials(
-        aws_access_key_id="AKID",
-        aws_secret_access_key="SECRET",
-        aws_session_token="TOKEN",
-    )
+    if wrap_in_overrides:
+        overrides = S3Overrides(credentials=creds)
+        assert overrides.credentials is not None
+        assert not callable(overrides.credentials)
+        creds = overrides.credentials
 
     assert creds.aws_access_key_id == "AKID"
     assert creds.aws_secret_access_key == "SECRET"
-    assert creds.aws_session_token == "TOKEN"
-
+    assert creds.aws_session_token == token
 
-def test_s3_overrides_with_static_credentials() -> None:
-    """Verify S3Overrides accepts static S3Credentials."""
-    creds = S3Credentials(
-        aws_access_key_id="AKID",
-        aws_secret_access_key="SECRET",
-        aws_session_token="TOKEN",
-    )
-    overrides = S3Overrides(credentials=creds)
-
-    assert overrides.credentials is not None
-    assert not callable(overrides.credentials)
-    assert overrides.credentials.aws_access_key_id == "AKID"
-    assert overrides.credentials.aws_session_token == "TOKEN"
 
-
-def test_s3_overrides_with_credential_provider() -> None:
+@pytest.mark.asyncio(loop_scope="module")  # type: ignore[misc]
+async def test_s3_overrides_with_credential_provider() -> None:
     """Verify S3Overrides accepts an async callable as credentials."""
-    import asyncio
 
     async def my_provider() -> S3Credentials:
         return S3Credentials(
@@ -281,22 +295,64 @@ def test_s3_overrides_with_credential_provider() -> None:
     assert overrides.credentials is not None
     assert callable(overrides.credentials)
     # Resolve the provider directly (not via the Union-typed field)
-    resolved: S3Credentials = asyncio.run(my_provider())
+    resolved: S3Credentials = await my_provider()
     assert resolved.aws_access_key_id == "ASYNC_AKID"
     assert resolved.aws_secret_access_key == "ASYNC_SECRET"
     assert resolved.aws_session_token == "ASYNC_TOKEN"
 
 
+def test_s3_overrides_botocore_config_combined_with_path_style() -> None:
+    """Verify botocore_config reaches the S3 client with force_path_style applied on top."""
+    from botocore.config import Config as BotocoreConfig
+
+    from immukv import ImmuKVClient
+
+    config = Config(
+        s3_bucket="test-bucket",
+        s3_region="us-east-1",
+        s3_prefix="test/",
+        overrides=S3Overrides(
+            endpoint_url="http://localhost:4566",
+            credentials=S3Credentials(aws_access_key_id="AKID", aws_secret_access_key="SECRET"),
+            force_path_style=True,
+            botocore_config=BotocoreConfig(
+                max_pool_connections=64, s3={"use_accelerate_endpoint": False}
+            ),
+        ),
+    )
+
+    client: ImmuKVClient[str, JSONValue] = ImmuKVClient(config, lambda v: v, lambda v: v)
+    with client:
+        client_config = client._s3._s3.meta.config  # type: ignore[misc]
+        assert client_config.max_pool_connections == 64  # type: ignore[attr-defined,misc]
+        assert client_config.s3 == {  # type: ignore[attr-defined,misc]
+            "use_accelerate_endpoint": False,
+            "addressing_style": "path",
+        }
+
+
 # --- Credential Provider Adapter Tests ---
 
 
-def test_credential_provider_refresh_adapter() -> None:
-    """Verify the refresh adapter correctly converts CredentialProvider output to botocore format."""
-    import asyncio
-    from datetime import datetime, timezone
+async def _refresh_from(provider: CredentialProvider) -> dict[str, str]:
+    """Convert CredentialProvider output to botocore's refresh format (as the client does)."""
+    creds = await provider()
+    if creds.expires_at is not None:
+        expiry = creds.expires_at
+    else:
+        expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+    token = creds.aws_session_token if creds.aws_session_token is not None else ""
+    return {
+        "access_key": creds.aws_access_key_id,
+        "secret_key": creds.aws_secret_access_key,
+        "token": token,
+        "expiry_time": expiry.isoformat(),
+    }
 
-    from aiobotocore.credentials import AioDeferredRefreshableCredentials
 
+@pytest.mark.asyncio(loop_scope="module")  # type: ignore[misc]
+async def test_credential_provider_refresh_adapter() -> None:
+    """Verify the refresh adapter correctly converts CredentialProvider output to botocore format."""
     expires = datetime(2030, 3, 1, 12, 0, 0, tzinfo=timezone.utc)
 
     async def my_provider() -> S3Credentials:
@@ -307,36 +363,18 @@ def test_credential_provider_refresh_adapter() -> None:
             expires_at=expires,
         )
 
-    async def _refresh() -> dict[str, str]:
-        from datetime import timedelta
-
-        creds = await my_provider()
-        if creds.expires_at is not None:
-            expiry = creds.expires_at
-        else:
-            expiry = datetime.now(timezone.utc) + timedelta(hours=1)
-        token = creds.aws_session_token if creds.aws_session_token is not None else ""
-        return {
-            "access_key": creds.aws_access_key_id,
-            "secret_key": creds.aws_secret_access_key,
-            "token": token,
-            "expiry_time": expiry.isoformat(),
-        }
-
-    async def run_test() -> None:
-        refreshable = AioDeferredRefreshableCredentials(refresh_using=_refresh, method="test")
-        frozen = await refreshable.get_frozen_credentials()
-        assert frozen.access_key == "REFRESH_AKID"
-        assert frozen.secret_key == "REFRESH_SECRET"
-        assert frozen.token == "REFRESH_TOKEN"
-
-    asyncio.run(run_test())
+    refreshable = AioDeferredRefreshableCredentials(
+        refresh_using=lambda: _refresh_from(my_provider), method="test"
+    )
+    frozen = await refreshable.get_frozen_credentials()
+    assert frozen.access_key == "REFRESH_AKID"
+    assert frozen.secret_key == "REFRESH_SECRET"
+    assert frozen.token == "REFRESH_TOKEN"
 
 
-def test_credential_provider_session_injection() -> None:
+@pytest.mark.asyncio(loop_scope="module")  # type: ignore[misc]
+async def test_credential_provider_session_injection() -> None:
     """Verify AioDeferredRefreshableCredentials can be injected into aiobotocore session."""
-    import asyncio
-    from datetime import datetime, timezone
 
     async def my_provider() -> S3Credentials:
         return S3Credentials(
@@ -346,40 +384,18 @@ def test_credential_provider_session_injection() -> None:
             expires_at=datetime(2030, 3, 1, 12, 0, 0, tzinfo=timezone.utc),
         )
 
-    async def run_test() -> None:
-        import aiobotocore.session
-        from aiobotocore.credentials import AioDeferredRefreshableCredentials
-
-        async def _refresh() -> dict[str, str]:
-            from datetime import timedelta
-
-            creds = await my_provider()
-            if creds.expires_at is not None:
-                expiry = creds.expires_at
-            else:
-                expiry = datetime.now(timezone.utc) + timedelta(hours=1)
-            token = creds.aws_session_token if creds.aws_session_token is not None else ""
-            return {
-                "access_key": creds.aws_access_key_id,
-                "secret_key": creds.aws_secret_access_key,
-                "token": token,
-                "expiry_time": expiry.isoformat(),
-            }
-
-        session = aiobotocore.session.get_session()
-        refreshable = AioDeferredRefreshableCredentials(
-            refresh_using=_refresh, method="test-injection"
-        )
-        session._credentials = refreshable  # type: ignore[attr-defined]
-
-        resolved = session._credentials  # type: ignore[attr-defined,misc]
-        assert resolved is refreshable  # type: ignore[misc]
-        frozen = await refreshable.get_frozen_credentials()  # type: ignore[misc]
-        assert frozen.access_key == "INJECT_AKID"  # type: ignore[misc]
-        assert frozen.secret_key == "INJECT_SECRET"  # type: ignore[misc]
-        assert frozen.token == "INJECT_TOKEN"  # type: ignore[misc]
+    session = aiobotocore.session.get_session()
+    refreshable = AioDeferredRefreshableCredentials(
+        refresh_using=lambda: _refresh_from(my_provider), method="test-injection"
+    )
+    session._credentials = refreshable  # type: ignore[attr-defined]
 
-    asyncio.run(run_test())
+    resolved = session._credentials  # type: ignore[attr-defined,misc]
+    assert resolved is refreshable  # type: ignore[misc]
+    frozen = await refreshable.get_frozen_credentials()  # type: ignore[misc]
+    assert frozen.access_key == "INJECT_AKID"  # type: ignore[misc]
+    assert frozen.secret_key == "INJECT_SECRET"  # type: ignore[misc]
+    assert frozen.token == "INJECT_TOKEN"  # type: ignore[misc]
 
 
 # --- Repaired ETag and orphan repair failure tests ---
@@ -390,11 +406,17 @@ def test_credential_provider_session_injection() -> None:
 # so no S3/MinIO is needed.
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from immukv import ImmuKVClient
+    from immukv._internal.types import LatestLogState, RawEntry
+    from immukv.json_helpers import JSONValue
 
 
 def _make_mock_client() -> "ImmuKVClient[str, object]":
     """Create an ImmuKVClient with a fully mocked S3 backend for unit testing."""
+    from collections import OrderedDict
+    from concurrent.futures import Future
     from typing import cast
     from unittest.mock import MagicMock
 
@@ -421,10 +443,31 @@ def _make_mock_client() -> "ImmuKVClient[str, object]":
     client._value_decoder = identity_decoder  # type: ignore[assignment]
     client._value_encoder = identity_encoder  # type: ignore[assignment]
     client._s3 = MagicMock(spec=BrandedS3Client)  # type: ignore[assignment]
+
+    def submit_put_object(**kwargs: object) -> "Future[object]":
+        # Route non-blocking puts through the put_object mock so tests configure one method
+        future: Future[object] = Future()
+        try:
+            future.set_result(client._s3.put_object(**kwargs))  # type: ignore[arg-type,misc]
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    client._s3.submit_put_object.side_effect = submit_put_object  # type: ignore[attr-defined,misc]
+    client._bucket = config.s3_bucket
+    client._keys_prefix = S3KeyPaths.keys_prefix(config.s3_prefix)
     client._log_key = S3KeyPaths.for_log(config.s3_prefix)  # type: ignore[assignment]
-    client._last_repair_check_ms = 0
+    client._next_repair_ms = 0
     client._can_write = None
     client._latest_orphan_status = None
+    client._key_etag_cache = {}
+    client._existing_key_objects = set()
+    client._log_body_cache = OrderedDict()
+    client._log_body_cache_bytes = 0
+    client._key_writer = None
+    client._pending_key_write = None
+    client._last_log_state = None
+    client._last_written_log_version_id = None
     return client
 
 
@@ -581,3 +624,470 @@ def test_set_does_not_throw_when_log_etag_is_none() -> None:
         entry = client.set("first-key", {"data": "first-value"})
         assert entry.key == "first-key"
         assert entry.value == {"data": "first-value"}
+
+
+def _healthy_latest_state(sequence: int) -> "LatestLogState[str]":
+    """Build a _get_latest_and_repair() result for a healthy log with no repair."""
+    from immukv._internal.types import hash_from_json, sequence_from_json
+
+    return {
+        "log_etag": '"some-log-etag"',
+        "prev_version_id": "prev-version-1",  # type: ignore[typeddict-item]
+        "prev_hash": hash_from_json("sha256:" + "d" * 64),
+        "sequence": sequence_from_json(sequence),
+        "can_write": True,
+        "orphan_status": {
+            "is_orphaned": False,
+            "orphan_key": None,
+            "orphan_entry": None,
+            "checked_at": 0,
+        },
+        "repaired_key": None,
+        "repaired_key_object_etag": None,
+    }
+
+
+def test_key_etag_cache_skips_headobject_on_repeated_set() -> None:
+    """Test that a second set() of the same key uses the ETag from the first write."""
+    from unittest.mock import patch
+
+    client = _make_mock_client()
+    client._s3.head_object.return_value = {  # type: ignore[attr-defined,misc]
+        "ETag": '"existing-key-etag"',
+        "VersionId": "existing-version-id",
+    }
+    client._s3.put_object.return_value = {  # type: ignore[attr-defined,misc]
+        "ETag": '"written-etag"',
+        "VersionId": "new-version-id",
+    }
+
+    with patch.object(client, "_get_latest_and_repair", return_value=_healthy_latest_state(0)):
+        client.set("cached-key", {"n": 1})
+        assert client._s3.head_object.call_count == 1  # type: ignore[attr-defined,misc]
+
+        client.set("cached-key", {"n": 2})
+        assert client._s3.head_object.call_count == 1  # type: ignore[attr-defined,misc]
+
+    # Second key object write is conditional on the ETag returned by the first
+    last_put = client._s3.put_object.call_args  # type: ignore[attr-defined,misc]
+    assert last_put.kwargs["if_match"] == '"written-etag"'  # type: ignore[misc]
+
+
+def test_stale_key_etag_cache_retries_key_object_write() -> None:
+    """Test that a stale cached ETag is refreshed and the key object write retried once."""
+    from io import BytesIO
+    from unittest.mock import patch
+
+    from botocore.exceptions import ClientError
+
+    client = _make_mock_client()
+    client._key_etag_cache["stale-key"] = '"stale-etag"'  # type: ignore[assignment]
+
+    precondition_failed = ClientError(
+        {"Error": {"Code": "PreconditionFailed", "Message": "Precondition Failed"}},  # type: ignore[misc]
+        "PutObject",
+    )
+    client._s3.put_object.side_effect = [  # type: ignore[attr-defined,misc]
+        {"ETag": '"log-etag"', "VersionId": "new-version-id"},  # type: ignore[misc]
+        precondition_failed,
+        {"ETag": '"fresh-write-etag"', "VersionId": "key-version-id"},  # type: ignore[misc]
+    ]
+    client._s3.get_object.return_value = {  # type: ignore[attr-defined,misc]
+        "Body": BytesIO(b'{"sequence":0}'),
+        "ETag": '"other-writer-etag"',
+        "VersionId": "other-version-id",
+    }
+
+    with patch.object(client, "_get_latest_and_repair", return_value=_healthy_latest_state(0)):
+        entry = client.set("stale-key", {"n": 2})
+
+    client._s3.head_object.assert_not_called()  # type: ignore[attr-defined]
+    retry_put = client._s3.put_object.call_args  # type: ignore[attr-defined,misc]
+    assert retry_put.kwargs["if_match"] == '"other-writer-etag"'  # type: ignore[misc]
+    assert entry.previous_key_object_etag == '"fresh-write-etag"'
+    assert client._key_etag_cache["stale-key"] == '"fresh-write-etag"'
+
+
+def test_cached_log_state_skips_preflight_on_repeated_set() -> None:
+    """Test that set() reuses the log state of its previous write instead of reading the log."""
+    from unittest.mock import patch
+
+    client = _make_mock_client()
+    client._s3.head_object.return_value = {  # type: ignore[attr-defined,misc]
+        "ETag": '"existing-key-etag"',
+        "VersionId": "existing-version-id",
+    }
+    client._s3.put_object.return_value = {  # type: ignore[attr-defined,misc]
+        "ETag": '"written-etag"',
+        "VersionId": "new-version-id",
+    }
+
+    with patch.object(
+        client, "_get_latest_and_repair", return_value=_healthy_latest_state(0)
+    ) as preflight:
+        first = client.set("key-a", {"n": 1})
+        second = client.set("key-b", {"n": 2})
+        client.set("key-c", {"n": 3})
+        assert preflight.call_count == 1
+
+    assert second.sequence == first.sequence + 1
+    assert second.previous_version_id == "new-version-id"
+    assert second.previous_hash == first.hash
+    second_log_put = client._s3.put_object.call_args_list[2]  # type: ignore[attr-defined,misc]
+    assert second_log_put.kwargs["if_match"] == '"written-etag"'  # type: ignore[misc]
+
+
+def test_cached_log_state_falls_back_to_preflight_on_conflict() -> None:
+    """Test that a log write conflict on cached state re-reads the log and retries."""
+    from unittest.mock import patch
+
+    from botocore.exceptions import ClientError
+
+    client = _make_mock_client()
+    client._s3.head_object.return_value = {  # type: ignore[attr-defined,misc]
+        "ETag": '"existing-key-etag"',
+        "VersionId": "existing-version-id",
+    }
+    precondition_failed = ClientError(
+        {"Error": {"Code": "PreconditionFailed", "Message": "Precondition Failed"}},  # type: ignore[misc]
+        "PutObject",
+    )
+    written = {"ETag": '"written-etag"', "VersionId": "new-version-id"}  # type: ignore[misc]
+    client._s3.put_object.side_effect = [  # type: ignore[attr-defined,misc]
+        written,
+        written,
+        precondition_failed,
+        written,
+        written,
+    ]
+
+    with patch.object(
+        client, "_get_latest_and_repair", return_value=_healthy_latest_state(5)
+    ) as preflight:
+        client.set("key-a", {"n": 1})
+        entry = client.set("key-a", {"n": 2})
+        assert preflight.call_count == 2
+
+    # Retried on the freshly read log state
+    assert entry.sequence == 6
+    # A conflict on a request the SDK did not retry is not checked against the own write
+    assert client._s3.head_object.call_count == 1  # type: ignore[attr-defined,misc]
+
+
+def test_log_write_conflict_from_own_retried_write_is_success() -> None:
+    """Test that a PreconditionFailed caused by an SDK retry of our own write is not a conflict."""
+    from unittest.mock import patch
+
+    from botocore.exceptions import ClientError
+
+    from immukv.client import WRITE_ID_METADATA_KEY
+
+    client = _make_mock_client()
+    client._key_etag_cache["own-key"] = '"key-etag"'  # type: ignore[assignment]
+    precondition_failed = ClientError(
+        {
+            "Error": {"Code": "PreconditionFailed", "Message": "Precondition Failed"},
+            "ResponseMetadata": {"RetryAttempts": 1},  # type: ignore[typeddict-item]
+        },  # type: ignore[misc]
+        "PutObject",
+    )
+    client._s3.put_object.side_effect = [  # type: ignore[attr-defined,misc]
+        precondition_failed,
+        {"ETag": '"written-etag"', "VersionId": "key-version-id"},  # type: ignore[misc]
+    ]
+
+    def head_object(bucket: str, key: str) -> Dict[str, object]:
+        log_put = client._s3.put_object.call_args_list[0]  # type: ignore[attr-defined,misc]
+        return {
+            "ETag": '"own-log-etag"',
+            "VersionId": "own-log-version",
+            "Metadata": log_put.kwargs["metadata"],  # type: ignore[misc]
+        }
+
+    client._s3.head_object.side_effect = head_object  # type: ignore[attr-defined,misc]
+
+    with patch.object(
+        client, "_get_latest_and_repair", return_value=_healthy_latest_state(0)
+    ) as preflight:
+        entry = client.set("own-key", {"n": 1})
+
+    assert preflight.call_count == 1
+    assert entry.version_id == "own-log-version"
+    log_put = client._s3.put_object.call_args_list[0]  # type: ignore[attr-defined,misc]
+    assert WRITE_ID_METADATA_KEY in log_put.kwargs["metadata"]  # type: ignore[misc]
+    assert client._last_log_state is not None
+    assert client._last_log_state["log_etag"] == '"own-log-etag"'
+
+
+class _FakeVersionedS3:
+    """In-memory stand-in for BrandedS3Client with conditional-write semantics.
+
+    Lets several clients share one bucket, so multi-writer sequences can be unit
+    tested. fail_next_put_to makes the next put_object to that path fail.
+    """
+
+    def __init__(self) -> None:
+        self.objects: Dict[str, Dict[str, object]] = {}
+        self.fail_next_put_to: Optional[str] = None
+        self._writes = 0
+
+    @staticmethod
+    def _error(code: str, operation: str) -> Exception:
+        from botocore.exceptions import ClientError
+
+        return ClientError(
+            {"Error": {"Code": code, "Message": code}},  # type: ignore[misc]
+            operation,
+        )
+
+    def put_object(
+        self,
+        bucket: str,
+        key: str,
+        body: bytes,
+        content_type: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, object]:
+        if self.fail_next_put_to == key:
+            self.fail_next_put_to = None
+            raise self._error("InternalError", "PutObject")
+        current = self.objects.get(key)
+        if if_match is not None and (current is None or current["ETag"] != if_match):
+            raise self._error("PreconditionFailed", "PutObject")
+        if if_none_match == "*" and current is not None:
+            raise self._error("PreconditionFailed", "PutObject")
+        self._writes += 1
+        self.objects[key] = {
+            "ETag": f'"etag-{self._writes}"',
+            "VersionId": f"version-{self._writes}",
+            "Body": body,
+            "Metadata": metadata if metadata is not None else {},
+        }
+        return {"ETag": self.objects[key]["ETag"], "VersionId": self.objects[key]["VersionId"]}
+
+    def submit_put_object(
+        self,
+        bucket: str,
+        key: str,
+        body: bytes,
+        content_type: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> "Future[Dict[str, object]]":
+        from concurrent.futures import Future
+
+        future: Future[Dict[str, object]] = Future()
+        try:
+            future.set_result(
+                self.put_object(bucket, key, body, content_type, if_match, if_none_match, metadata)
+            )
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def head_object(self, bucket: str, key: str) -> Dict[str, object]:
+        current = self.objects.get(key)
+        if current is None:
+            raise self._error("404", "HeadObject")
+        return {k: v for k, v in current.items() if k != "Body"}
+
+    def get_object(
+        self, bucket: str, key: str, version_id: Optional[str] = None
+    ) -> Dict[str, object]:
+        from io import BytesIO
+
+        current = self.objects.get(key)
+        if current is None:
+            raise self._error("NoSuchKey", "GetObject")
+        return {**current, "Body": BytesIO(cast(bytes, current["Body"]))}
+
+
+def test_read_only_orphan_check_skips_headobject_for_known_key() -> None:
+    """Test that a client that cannot write checks a key object's existence only once.
+
+    The knowledge survives other writers appending to the log, since key objects
+    are never deleted.
+    """
+    from unittest.mock import MagicMock
+
+    fake = _FakeVersionedS3()
+    writer = _make_mock_client()
+    writer._s3 = fake  # type: ignore[assignment]
+    reader = _make_mock_client()
+    reader._can_write = False
+    reader._s3 = MagicMock(wraps=fake)  # type: ignore[assignment]
+
+    for n in range(3):
+        writer.set("seen-key", {"n": n})
+        state = reader._get_latest_and_repair()
+        assert state["can_write"] is False
+        assert state["orphan_status"] is not None
+        assert state["orphan_status"]["is_orphaned"] is False
+
+    assert reader._s3.head_object.call_count == 1  # type: ignore[attr-defined,misc]
+
+
+def test_orphan_repair_after_other_writer_updated_key() -> None:
+    """Test that an orphan is repaired when another client wrote its key in the meantime.
+
+    A's cached key object ETag goes stale when B writes the same key. A's next
+    entry must carry B's ETag as previous_key_object_etag, or repairing it fails.
+    """
+    import json
+
+    fake = _FakeVersionedS3()
+    a = _make_mock_client()
+    b = _make_mock_client()
+    a._s3 = fake  # type: ignore[assignment]
+    b._s3 = fake  # type: ignore[assignment]
+    key_path = a._key_path("k")
+
+    a.set("k", {"v": "A1"})
+    b.set("k", {"v": "B1"})
+    b.set("j", {"v": "B2"})
+
+    # A's key object write fails, leaving its log entry orphaned
+    fake.fail_next_put_to = key_path
+    a.set("k", {"v": "A2"})
+
+    # B's next writes repair the orphan
+    b.set("j", {"v": "B3"})
+    b.set("j", {"v": "B4"})
+
+    key_object = json.loads(cast(bytes, fake.objects[key_path]["Body"]))  # type: ignore[misc]
+    assert key_object["value"] == {"v": "A2"}  # type: ignore[misc]
+
+
+def test_other_writer_drops_cached_etags_but_keeps_known_key_objects() -> None:
+    """Test the log-moved invalidation together with the read-only existence check.
+
+    Another writer's append must drop the ETags used as IfMatch for key object
+    writes, but not the knowledge that a key object exists.
+    """
+    import json
+    from unittest.mock import MagicMock
+
+    fake = _FakeVersionedS3()
+    a = _make_mock_client()
+    b = _make_mock_client()
+    a._s3 = MagicMock(wraps=fake)  # type: ignore[assignment]
+    b._s3 = fake  # type: ignore[assignment]
+    key_path = a._key_path("k")
+
+    a.set("k", {"v": "A1"})
+    b.set("k", {"v": "B1"})
+    a._next_repair_ms = 0  # Due for a repair check, which sees B's entry
+    assert a.get("k").value == {"v": "B1"}
+    assert "k" not in a._key_etag_cache
+    assert "k" in a._existing_key_objects
+
+    # The next write of k reads the current ETag instead of reusing A1's
+    heads = a._s3.head_object.call_count  # type: ignore[attr-defined,misc]
+    entry_etag = fake.objects[key_path]["ETag"]
+    a.set("k", {"v": "A2"})
+    assert a._s3.head_object.call_count == heads + 1  # type: ignore[attr-defined,misc]
+    log_entry = json.loads(cast(bytes, fake.objects[a._log_key]["Body"]))  # type: ignore[misc]
+    assert log_entry["previous_key_object_etag"] == entry_etag  # type: ignore[misc]
+
+    # Once it cannot write, checking k after another append needs no head_object
+    a._can_write = False
+    b.set("k", {"v": "B2"})
+    a._get_latest_and_repair()
+    assert a._s3.head_object.call_count == heads + 1  # type: ignore[attr-defined,misc]
+
+
+def test_get_log_version_serves_repeat_reads_from_body_cache() -> None:
+    """Test that a log version is fetched once and decoded into fresh values each time."""
+    from io import BytesIO
+
+    client = _make_mock_client()
+    client._s3.get_object.return_value = {  # type: ignore[attr-defined,misc]
+        "Body": BytesIO(
+            b'{"sequence":0,"key":"k","value":{"n":1},"timestamp_ms":1700000000000,'
+            b'"hash":"sha256:genesis","previous_hash":"sha256:genesis"}'
+        ),
+    }
+
+    first = client.get_log_version("log-version-1")  # type: ignore[arg-type]
+    first.value["n"] = 2  # type: ignore[index]
+    second = client.get_log_version("log-version-1")  # type: ignore[arg-type]
+
+    assert client._s3.get_object.call_count == 1  # type: ignore[attr-defined,misc]
+    assert second.value == {"n": 1}
+    assert second.version_id == "log-version-1"
+
+
+def test_log_body_cache_is_bounded_by_total_bytes() -> None:
+    """Test that the body cache evicts by total size and skips oversized bodies."""
+    from io import BytesIO
+    from unittest.mock import patch
+
+    client = _make_mock_client()
+    body = (
+        b'{"sequence":0,"key":"k","value":{"n":1},"timestamp_ms":1700000000000,'
+        b'"hash":"sha256:genesis","previous_hash":"sha256:genesis"}'
+    )
+    large_body = body.replace(b'{"n":1}', b'{"n":"' + b"x" * 200 + b'"}')
+    client._s3.get_object.side_effect = lambda **kwargs: {  # type: ignore[attr-defined,misc]
+        "Body": BytesIO(large_body if kwargs["version_id"] == "large" else body)  # type: ignore[misc]
+    }
+
+    with (
+        patch("immukv.client.LOG_BODY_CACHE_MAX_BYTES", 2 * len(body)),
+        patch("immukv.client.LOG_BODY_CACHE_MAX_BODY_BYTES", len(body)),
+    ):
+        for version_id in ["v1", "v2", "v3", "large"]:
+            client.get_log_version(version_id)  # type: ignore[arg-type]
+
+    assert list(client._log_body_cache) == ["v2", "v3"]
+    assert client._log_body_cache_bytes == 2 * len(body)
+
+
+def _raw_chain(length: int) -> "List[RawEntry[str]]":
+    """Build a valid raw hash chain, newest entry first."""
+    from immukv._internal.types import RawEntry
+
+    entries: List[RawEntry[str]] = []
+    previous_hash: Hash[str] = hash_genesis()
+    for n in range(length):
+        data: LogEntryForHash[str, JSONValue] = {
+            "sequence": sequence_from_json(n),
+            "key": f"key-{n % 3}",
+            "value": {"n": n},
+            "timestamp_ms": timestamp_from_json(1700000000000 + n),
+            "previous_hash": previous_hash,
+        }
+        entry_hash: Hash[str] = hash_compute(data)
+        entries.append(
+            RawEntry(
+                key=data["key"],
+                value=data["value"],
+                timestamp_ms=data["timestamp_ms"],
+                version_id=f"version-{n}",  # type: ignore[arg-type]
+                sequence=data["sequence"],
+                previous_version_id=None,
+                hash=entry_hash,
+                previous_hash=previous_hash,
+            )
+        )
+        previous_hash = entry_hash
+    entries.reverse()
+    return entries
+
+
+def test_verify_log_chain_detects_tampered_entry() -> None:
+    """Test that verify_log_chain detects a tampered entry whose linkage is intact."""
+    from unittest.mock import patch
+
+    client = _make_mock_client()
+    entries = _raw_chain(5)
+
+    with patch.object(client, "_raw_log_entries", return_value=entries):
+        assert client.verify_log_chain() is True
+
+    entries[2].value = {"n": -1}
+    with patch.object(client, "_raw_log_entries", return_value=entries):
+        assert client.verify_log_chain() is False
@@ -5,32 +5,38 @@ operate when the shared global log contains entries written by wide-typed (or
 differently-typed) clients. The key invariant: internal operations (pre-flight
 repair, orphan check) never invoke the narrow decoder on cross-type entries.
 
-Requires MinIO running and test actual S3 operations.
-Run with: IMMUKV_INTEGRATION_TEST=true IMMUKV_S3_ENDPOINT=http://localhost:9000 pytest
+By default the tests run against an in-process moto S3 server. Tests marked `s3`
+need a real endpoint (MinIO) and only run in integration mode:
+IMMUKV_INTEGRATION_TEST=true IMMUKV_S3_ENDPOINT=http://localhost:9000 pytest
 """
 
 import asyncio
 import concurrent.futures
 import os
+import time
 import uuid
 from collections.abc import Coroutine
-from contextlib import AsyncExitStack
-from typing import TYPE_CHECKING, Dict, Generator, TypeVar, TypedDict, cast
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Generator, List, TypeVar, TypedDict, Union, cast
 
 import pytest
+from botocore.config import Config as BotocoreConfig
+from botocore.exceptions import ClientError, EndpointConnectionError
 
 if TYPE_CHECKING:
     from types_aiobotocore_s3.client import S3Client
+    from types_aiobotocore_s3.type_defs import ObjectIdentifierTypeDef
 
 from immukv import Config, ImmuKVClient
 from immukv.json_helpers import JSONValue
 from immukv.types import S3Credentials, S3Overrides
 
-# Skip if not in integration test mode
-pytestmark = pytest.mark.skipif(
-    os.getenv("IMMUKV_INTEGRATION_TEST") != "true",
-    reason="Integration tests require IMMUKV_INTEGRATION_TEST=true",
-)
+INTEGRATION_TEST = os.getenv("IMMUKV_INTEGRATION_TEST") == "true"
+
+# Environment read once at import; every fixture and config below uses these
+S3_ENDPOINT = os.getenv("IMMUKV_S3_ENDPOINT", "http://localhost:9000")
+ACCESS_KEY = os.getenv("AWS_ACCESS_KEY_ID", "test")
+SECRET_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "test")
 
 
 # ---------------------------------------------------------------------------
@@ -54,6 +60,10 @@ class NarrowA(TypedDict):
     temp: float
 
 
+# Values for the write loops below, built once rather than per iteration
+NARROW_TEMPS = [NarrowA(temp=float(i)) for i in range(10)]
+
+
 def narrow_a_decoder(value: JSONValue) -> NarrowA:
     """Decode JSONValue into NarrowA, accepting any dict with 'temp'."""
     d = cast(Dict[str, object], value)
@@ -74,8 +84,7 @@ class NarrowB(TypedDict):
 def narrow_b_decoder(value: JSONValue) -> NarrowB:
     """Decode JSONValue into NarrowB, accepting any dict with 'count'."""
     d = cast(Dict[str, object], value)
-    raw_count: object = d["count"]
-    return NarrowB(count=int(cast(int, raw_count)))
+    return NarrowB(count=int(cast(int, d["count"])))
 
 
 def narrow_b_encoder(value: NarrowB) -> JSONValue:
@@ -86,7 +95,7 @@ def narrow_b_encoder(value: NarrowB) -> JSONValue:
 def strict_narrow_a_decoder(value: JSONValue) -> NarrowA:
     """Strict decoder that RAISES on unexpected shapes (for test 8)."""
     d = cast(Dict[str, object], value)
-    if set(d.keys()) != {"temp"}:
+    if len(d) != 1 or "temp" not in d:
         raise ValueError(f"strict_narrow_a_decoder: unexpected shape {set(d.keys())}")
     return NarrowA(temp=float(cast(object, d["temp"])))  # type: ignore[arg-type]
 
@@ -115,7 +124,13 @@ def _aio_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     """Provide a background event loop for test fixtures."""
     import threading
 
-    loop = asyncio.new_event_loop()
+    loop: asyncio.AbstractEventLoop
+    try:
+        import uvloop
+
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
     thread = threading.Thread(target=loop.run_forever, name="test-io", daemon=True)
     thread.start()
     yield loop
@@ -125,32 +140,44 @@ def _aio_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 
 
 @pytest.fixture(scope="session")
-def raw_s3(_aio_loop: asyncio.AbstractEventLoop) -> Generator["S3Client", None, None]:
+def s3_endpoint() -> Generator[str, None, None]:
+    """S3 endpoint URL: the configured MinIO in integration mode, else an in-process moto server."""
+    if INTEGRATION_TEST:
+        yield S3_ENDPOINT
+        return
+
+    from moto.server import ThreadedMotoServer
+
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def raw_s3(
+    s3_endpoint: str, _aio_loop: asyncio.AbstractEventLoop
+) -> Generator["S3Client", None, None]:
     """Create raw aiobotocore S3 client for bucket management operations."""
     import aiobotocore.session
 
-    endpoint_url = os.getenv("IMMUKV_S3_ENDPOINT", "http://localhost:4566")
-    access_key = os.getenv("AWS_ACCESS_KEY_ID", "test")
-    secret_key = os.getenv("AWS_SECRET_ACCESS_KEY", "test")
-
-    async def _create() -> tuple["S3Client", AsyncExitStack]:
-        stack = AsyncExitStack()
+    async def _create() -> "S3Client":
         session = aiobotocore.session.get_session()
-        client: "S3Client" = await stack.enter_async_context(
-            session.create_client(
-                "s3",
-                endpoint_url=endpoint_url,
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
-                region_name="us-east-1",
-            )
-        )
-        return client, stack
+        # Enter the client directly; its own __aexit__ closes it at teardown
+        client: "S3Client" = await session.create_client(
+            "s3",
+            endpoint_url=s3_endpoint,
+            aws_access_key_id=ACCESS_KEY,
+            aws_secret_access_key=SECRET_KEY,
+            region_name="us-east-1",
+        ).__aenter__()
+        return client
 
     future = asyncio.run_coroutine_threadsafe(_create(), _aio_loop)
-    client, stack = future.result()
+    client = future.result()
     yield client
-    future_close = asyncio.run_coroutine_threadsafe(stack.aclose(), _aio_loop)
+    future_close = asyncio.run_coroutine_threadsafe(client.__aexit__(None, None, None), _aio_loop)
     future_close.result()
 
 
@@ -166,11 +193,48 @@ def _run_sync(coro: Coroutine[object, object, _T], loop: asyncio.AbstractEventLo
     return future.result()
 
 
-@pytest.fixture  # type: ignore[misc]
+def _run_sync_many(
+    coros: List[Coroutine[object, object, _T]], loop: asyncio.AbstractEventLoop
+) -> List[Union[_T, BaseException]]:
+    """Run coroutines concurrently on the background loop, blocking until all complete.
+
+    Exceptions are returned in place of results rather than raised.
+    """
+
+    async def _all() -> List[Union[_T, BaseException]]:
+        return await asyncio.gather(*coros, return_exceptions=True)
+
+    return _run_sync(_all(), loop)
+
+
+# Maximum number of objects a single delete_objects request accepts
+DELETE_OBJECTS_MAX_KEYS = 1000
+
+# Bucket cleanup attempts, with exponential backoff starting at CLEANUP_BACKOFF_S
+CLEANUP_ATTEMPTS = 3
+CLEANUP_BACKOFF_S = 0.1
+
+
+async def _list_all_versions(
+    raw_s3: "S3Client", bucket_name: str
+) -> List["ObjectIdentifierTypeDef"]:
+    """List every object version and delete marker in a bucket, across all pages."""
+    objects: List["ObjectIdentifierTypeDef"] = []
+    paginator = raw_s3.get_paginator("list_object_versions")
+    async for page in paginator.paginate(Bucket=bucket_name):
+        for version in [
+            *page.get("Versions", []),  # type: ignore[misc]
+            *page.get("DeleteMarkers", []),  # type: ignore[misc]
+        ]:
+            objects.append({"Key": version["Key"], "VersionId": version["VersionId"]})  # type: ignore[misc]
+    return objects
+
+
+@pytest.fixture(scope="session")
 def s3_bucket(
     raw_s3: "S3Client", _aio_loop: asyncio.AbstractEventLoop
 ) -> Generator[str, None, None]:
-    """Create unique S3 bucket for each test -- ensures complete isolation."""
+    """Create one versioned S3 bucket for the session; tests are isolated by test_prefix."""
     bucket_name = f"test-codec-{uuid.uuid4().hex[:8]}"
     _run_sync(raw_s3.create_bucket(Bucket=bucket_name), _aio_loop)
     _run_sync(
@@ -182,57 +246,113 @@ def s3_bucket(
 
     yield bucket_name
 
-    # Cleanup
-    try:
-        response = _run_sync(raw_s3.list_object_versions(Bucket=bucket_name), _aio_loop)
-        for version in response.get("Versions", []):  # type: ignore[misc,attr-defined]
-            _run_sync(
-                raw_s3.delete_object(
-                    Bucket=bucket_name,
-                    Key=version["Key"],  # type: ignore[misc]
-                    VersionId=version["VersionId"],  # type: ignore[misc]
-                ),
-                _aio_loop,
-            )
-        for marker in response.get("DeleteMarkers", []):  # type: ignore[misc,attr-defined]
-            _run_sync(
-                raw_s3.delete_object(
-                    Bucket=bucket_name,
-                    Key=marker["Key"],  # type: ignore[misc]
-                    VersionId=marker["VersionId"],  # type: ignore[misc]
-                ),
-                _aio_loop,
-            )
+    def _cleanup() -> None:
+        objects = iter(_run_sync(_list_all_versions(raw_s3, bucket_name), _aio_loop))
+        batches: List[List["ObjectIdentifierTypeDef"]] = []
+        while batch := list(islice(objects, DELETE_OBJECTS_MAX_KEYS)):
+            batches.append(batch)
+        results = _run_sync_many(
+            [
+                raw_s3.delete_objects(Bucket=bucket_name, Delete={"Objects": batch, "Quiet": True})
+                for batch in batches
+            ],
+            _aio_loop,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+            if result.get("Errors"):
+                raise RuntimeError(f"delete_objects failed: {result['Errors']}")
         _run_sync(raw_s3.delete_bucket(Bucket=bucket_name), _aio_loop)
-    except Exception as e:
-        print(f"Warning: Cleanup failed for bucket {bucket_name}: {e}")
 
+    # Retry transient S3 failures; anything left failing after the last attempt is reported
+    for attempt in range(CLEANUP_ATTEMPTS):
+        try:
+            _cleanup()
+            break
+        except (ClientError, EndpointConnectionError):  # type: ignore[misc]
+            if attempt == CLEANUP_ATTEMPTS - 1:
+                raise
+            time.sleep(CLEANUP_BACKOFF_S * (1 << attempt))
+
+
+# pytest-xdist worker running this module ("main" without xdist)
+_XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+@pytest.fixture  # type: ignore[misc]
+def test_prefix() -> str:
+    """Unique S3 prefix for each test -- ensures complete isolation within the bucket.
+
+    Namespaced by pytest-xdist worker, so runs with `pytest -n auto` stay isolated.
+    """
+    return f"test/{_XDIST_WORKER}/{uuid.uuid4().hex[:8]}/"
+
+
+# One botocore configuration for every client in the module: a larger connection pool,
+# short timeouts and no SDK retries, so a failing local endpoint surfaces immediately
+# instead of through retry backoff in the repair_interval_ms=0 tests
+_BOTOCORE_CONFIG = BotocoreConfig(
+    max_pool_connections=64,
+    retries={"max_attempts": 1, "mode": "standard"},
+    connect_timeout=2,
+    read_timeout=5,
+    tcp_keepalive=True,
+)
 
-def _make_config(s3_bucket: str, repair_interval_ms: int = 0) -> Config:
-    """Build a Config pointed at the local MinIO with the given repair interval."""
-    endpoint_url = os.getenv("IMMUKV_S3_ENDPOINT", "http://localhost:9000")
-    access_key = os.getenv("AWS_ACCESS_KEY_ID", "test")
-    secret_key = os.getenv("AWS_SECRET_ACCESS_KEY", "test")
+
+def _make_config(
+    s3_endpoint: str, s3_bucket: str, prefix: str, repair_interval_ms: int = 0
+) -> Config:
+    """Build a Config pointed at the test endpoint with the given prefix and repair interval."""
     return Config(
         s3_bucket=s3_bucket,
         s3_region="us-east-1",
-        s3_prefix="test/",
+        s3_prefix=prefix,
         repair_check_interval_ms=repair_interval_ms,
         overrides=S3Overrides(
-            endpoint_url=endpoint_url,
+            endpoint_url=s3_endpoint,
             credentials=S3Credentials(
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
+                aws_access_key_id=ACCESS_KEY,
+                aws_secret_access_key=SECRET_KEY,
             ),
             force_path_style=True,
+            botocore_config=_BOTOCORE_CONFIG,
         ),
     )
 
 
+@pytest.fixture(scope="module")
+def _shared_wide_client(
+    s3_endpoint: str, s3_bucket: str
+) -> Generator[ImmuKVClient[str, object], None, None]:
+    """Wide client entered once per module, on a prefix shared by the tests that use it."""
+    prefix = f"test/{_XDIST_WORKER}/shared-{uuid.uuid4().hex[:8]}/"
+    config = _make_config(s3_endpoint, s3_bucket, prefix, repair_interval_ms=0)
+    instance: ImmuKVClient[str, object] = ImmuKVClient(config, identity_decoder, identity_encoder)
+    with instance as c:
+        yield c
+
+
 @pytest.fixture  # type: ignore[misc]
-def wide_client(s3_bucket: str) -> Generator[ImmuKVClient[str, object], None, None]:
-    """Wide client with identity codec — accepts any JSONValue."""
-    config = _make_config(s3_bucket, repair_interval_ms=0)
+def wide_client(
+    request: pytest.FixtureRequest, s3_endpoint: str, s3_bucket: str
+) -> Generator[ImmuKVClient[str, object], None, None]:
+    """Wide client with identity codec — accepts any JSONValue.
+
+    By default tests share one module-scoped client and log, with no reset in
+    between, so each test sees the entries of the tests that ran before it. That
+    is only sound for tests that assert on values they wrote themselves and on the
+    latest log entry, which their own writes determine. Tests that assert on the
+    log as a whole (verify_log_chain, log_entries, history) must be marked
+    `no_share`; they get their own client on a fresh test_prefix.
+    """
+    if request.node.get_closest_marker("no_share") is None:  # type: ignore[misc]
+        yield cast(ImmuKVClient[str, object], request.getfixturevalue("_shared_wide_client"))
+        return
+
+    test_prefix = cast(str, request.getfixturevalue("test_prefix"))
+    config = _make_config(s3_endpoint, s3_bucket, test_prefix, repair_interval_ms=0)
     instance: ImmuKVClient[str, object] = ImmuKVClient(config, identity_decoder, identity_encoder)
     with instance as c:
         yield c
@@ -247,6 +367,7 @@ class TestSetPreFlightSurvivesCrossTypeLogEntries:
     """Verify that a narrow client's set() does not crash when the global log
     contains entries written by a wide (or differently-typed) client."""
 
+    @pytest.mark.s3
     def test_narrow_set_after_wide_write(
         self, s3_bucket: str, wide_client: ImmuKVClient[str, object]
     ) -> None:
@@ -341,13 +462,15 @@ class TestGetPeriodicRepairSurvivesCrossTypeEntries:
         result = narrow.get("sensor-01")
         assert result.value == {"temp": 25.0}
 
-    def test_narrow_get_triggers_repair_on_wide_orphan(self, s3_bucket: str) -> None:
+    def test_narrow_get_triggers_repair_on_wide_orphan(
+        self, s3_endpoint: str, s3_bucket: str, test_prefix: str
+    ) -> None:
         """Test 5: Narrow get() triggers repair on wide-typed orphan.
 
         When the latest log entry is wide-typed AND orphaned, the narrow
         client's repair must preserve the raw value without decoding.
         """
-        config = _make_config(s3_bucket, repair_interval_ms=0)
+        config = _make_config(s3_endpoint, s3_bucket, test_prefix, repair_interval_ms=0)
         wide: ImmuKVClient[str, object] = ImmuKVClient(config, identity_decoder, identity_encoder)
         with wide:
             # Write narrow entry (gives get() something to find)
@@ -375,13 +498,16 @@ class TestRepairOrphanPreservesDataIntegrity:
     """Verify that orphan repair preserves the raw JSON value verbatim,
     without any decode/encode round-trip that could lose data."""
 
-    def test_repair_preserves_wide_value_verbatim(self, s3_bucket: str) -> None:
+    @pytest.mark.s3
+    def test_repair_preserves_wide_value_verbatim(
+        self, s3_endpoint: str, s3_bucket: str, test_prefix: str
+    ) -> None:
         """Test 6: Repair preserves wide-typed value verbatim.
 
         A wide entry with many fields must not lose any fields when repaired
         by a narrow client (no decode->encode elimination).
         """
-        config = _make_config(s3_bucket, repair_interval_ms=0)
+        config = _make_config(s3_endpoint, s3_bucket, test_prefix, repair_interval_ms=0)
         wide: ImmuKVClient[str, object] = ImmuKVClient(config, identity_decoder, identity_encoder)
         with wide:
             # Write a rich wide-typed value
@@ -407,13 +533,15 @@ class TestRepairOrphanPreservesDataIntegrity:
             assert result_value["location"] == "building-A"
             assert result_value["tags"] == ["indoor", "floor-3"]
 
-    def test_repair_with_lossy_decoder_does_not_corrupt(self, s3_bucket: str) -> None:
+    def test_repair_with_lossy_decoder_does_not_corrupt(
+        self, s3_endpoint: str, s3_bucket: str, test_prefix: str
+    ) -> None:
         """Test 7: Repair with lossy narrow decoder does not corrupt.
 
         Even if the narrow decoder strips fields, repair must use the raw
         log value (not decoder output), so no data is lost.
         """
-        config = _make_config(s3_bucket, repair_interval_ms=0)
+        config = _make_config(s3_endpoint, s3_bucket, test_prefix, repair_interval_ms=0)
         wide: ImmuKVClient[str, object] = ImmuKVClient(config, identity_decoder, identity_encoder)
         with wide:
             # Write a value with many fields
@@ -535,14 +663,16 @@ class TestEdgeCases:
         entry_b = narrow_b.set("counter-04", NarrowB(count=400))
         assert entry_b.value == {"count": 400}
 
-    def test_rapid_alternating_set_with_repair_interval_zero(self, s3_bucket: str) -> None:
+    def test_rapid_alternating_set_with_repair_interval_zero(
+        self, s3_endpoint: str, s3_bucket: str, test_prefix: str
+    ) -> None:
         """Test 11: Rapid alternating set() with repair interval 0ms.
 
         Every call triggers repair with cross-type latest. With repair_interval_ms=0,
         every set() and get() forces the pre-flight / repair check, exercising the
         code path where the latest log entry is always the other type.
         """
-        config = _make_config(s3_bucket, repair_interval_ms=0)
+        config = _make_config(s3_endpoint, s3_bucket, test_prefix, repair_interval_ms=0)
         wide: ImmuKVClient[str, object] = ImmuKVClient(config, identity_decoder, identity_encoder)
         with wide:
             narrow: ImmuKVClient[str, NarrowA] = wide.with_codec(narrow_a_decoder, narrow_a_encoder)
@@ -550,7 +680,7 @@ class TestEdgeCases:
             # Rapid alternation — each set() sees the other type as latest
             for i in range(10):
                 wide.set(f"w-{i}", {"wide": True, "i": i})
-                narrow.set(f"n-{i}", NarrowA(temp=float(i)))
+                narrow.set(f"n-{i}", NARROW_TEMPS[i])
 
             # Verify all entries are readable
             for i in range(10):
@@ -566,6 +696,7 @@ class TestEdgeCases:
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.no_share  # verify_log_chain() asserts on the whole log
 class TestVerifyLogChainSurvivesCrossTypeEntries:
     """Verify that verify_log_chain() does not crash when the shared log
     contains entries written by differently-typed clients."""
@@ -587,6 +718,7 @@ class TestVerifyLogChainSurvivesCrossTypeEntries:
 
         assert narrow.verify_log_chain() is True
 
+    @pytest.mark.s3
     def test_verify_log_chain_detects_actual_corruption(
         self, s3_bucket: str, wide_client: ImmuKVClient[str, object]
     ) -> None:
@@ -632,7 +764,7 @@ class TestVerifyLogChainSurvivesCrossTypeEntries:
 
         for i in range(5):
             wide_client.set(f"w-{i}", {"wide": True, "i": i})
-            narrow.set(f"n-{i}", NarrowA(temp=float(i)))
+            narrow.set(f"n-{i}", NARROW_TEMPS[i])
 
         assert narrow.verify_log_chain(limit=3) is True
 
@@ -661,7 +793,7 @@ class TestVerifyLogChainSurvivesCrossTypeEntries:
 
         for i in range(10):
             wide_client.set("wide-key", {"kind": "misc", "iteration": i})
-            narrow.set("temp-key", NarrowA(temp=float(i)))
+            narrow.set("temp-key", NARROW_TEMPS[i])
 
         assert narrow.verify_log_chain() is True
         assert wide_client.verify_log_chain() is True